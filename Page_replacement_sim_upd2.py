@@ -1,88 +1,139 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import heapq
+from collections import OrderedDict
 import numpy as np
 import matplotlib.pyplot as plt
+from frame_history import FrameHistory
+from page_replacement_engines import clock_page_replacement, lfu_page_replacement
+from page_replacement_plots import TABLE_STEP_LIMIT, visualize_history_viewport
 
 # ------------------ Page Replacement Algorithms ------------------
 def fifo_page_replacement(pages, frames):
     frame_list = []
-    history = []
+    history = FrameHistory(frames)
     hits, misses = 0, 0
+    resident = set()
+    oldest = 0  # Slot holding the oldest page
 
-    for page in pages:
-        if page in frame_list:
+    for i, page in enumerate(pages):
+        if page in resident:
             hits += 1
         else:
             misses += 1
             if len(frame_list) < frames:
+                history.record(i, len(frame_list), page)
                 frame_list.append(page)
             else:
-                frame_list.pop(0)
-                frame_list.append(page)
-        history.append(frame_list.copy())
+                resident.discard(frame_list[oldest])
+                frame_list[oldest] = page
+                history.record(i, oldest, page)
+                oldest = (oldest + 1) % frames
+            resident.add(page)
+
+    history.finish(len(pages))
 
     return history, hits, misses
 
 def lru_page_replacement(pages, frames):
     frame_list = []
-    history = []
+    history = FrameHistory(frames)
     hits, misses = 0, 0
-    page_order = []
+    page_order = OrderedDict()  # page -> slot, least recently used first
 
-    for page in pages:
-        if page in frame_list:
+    for i, page in enumerate(pages):
+        if page in page_order:
             hits += 1
-            page_order.remove(page)
+            page_order.move_to_end(page)
         else:
             misses += 1
             if len(frame_list) < frames:
+                page_order[page] = len(frame_list)
+                history.record(i, len(frame_list), page)
                 frame_list.append(page)
             else:
-                lru_page = page_order.pop(0)
-                frame_list[frame_list.index(lru_page)] = page
+                lru_page, slot = page_order.popitem(last=False)
+                frame_list[slot] = page
+                history.record(i, slot, page)
+                page_order[page] = slot
 
-        page_order.append(page)
-        history.append(frame_list.copy())
+    history.finish(len(pages))
 
     return history, hits, misses
 
+def next_use_indices(pages):
+    # Index of the next reference to pages[i], or len(pages) if there is none
+    n = len(pages)
+    next_use = [n] * n
+    last_seen = {}
+    for i in range(n - 1, -1, -1):
+        next_use[i] = last_seen.get(pages[i], n)
+        last_seen[pages[i]] = i
+    return next_use
+
 def optimal_page_replacement(pages, frames):
     frame_list = []
-    history = []
+    history = FrameHistory(frames)
     hits, misses = 0, 0
+    slot_of = {}
+    slot_next = []
+    heap = []
+
+    next_use = next_use_indices(pages)
 
     for i in range(len(pages)):
         page = pages[i]
+        slot = slot_of.get(page)
 
-        if page in frame_list:
+        if slot is not None:
             hits += 1
         else:
             misses += 1
             if len(frame_list) < frames:
+                slot = len(frame_list)
                 frame_list.append(page)
+                slot_next.append(0)
             else:
-                future_use = {frame: pages[i+1:].index(frame) if frame in pages[i+1:] else float('inf') for frame in frame_list}
-                page_to_replace = max(future_use, key=future_use.get)
-                frame_list[frame_list.index(page_to_replace)] = page
-
-        history.append(frame_list.copy())
+                while True:
+                    neg_next, slot = heapq.heappop(heap)
+                    if slot_next[slot] == -neg_next:
+                        break
+                del slot_of[frame_list[slot]]
+                frame_list[slot] = page
+            slot_of[page] = slot
+            history.record(i, slot, page)
+
+        slot_next[slot] = next_use[i]
+        heapq.heappush(heap, (-next_use[i], slot))
+        if len(heap) > 2 * frames + 16:
+            heap = [(-slot_next[s], s) for s in range(len(frame_list))]
+            heapq.heapify(heap)
+
+    history.finish(len(pages))
 
     return history, hits, misses
 
 # ------------------ Visualization ------------------
 def plot_history(history, page_refs, hits, misses, algorithm):
+    if len(page_refs) > TABLE_STEP_LIMIT:
+        # A dense grid with a tick per reference does not scale: scroll through it instead
+        visualize_history_viewport(algorithm, history, page_refs)
+        return
+
     fig, ax = plt.subplots(figsize=(8, 6))
 
-    # Ensure all lists in history are of the same length (pad with -1 if needed)
-    max_len = max(len(x) for x in history)
-    history = [x + [-1] * (max_len - len(x)) for x in history]
+    # Replay the history into a frames x steps grid (empty slots stay -1)
+    max_len = history.occupied
+    grid = np.full((max_len, len(history)), -1)
+    for step, state in enumerate(history):
+        grid[:len(state), step] = state
 
-    ax.imshow(np.array(history).T, cmap="Blues", aspect="auto")
+    ax.imshow(grid, cmap="Blues", aspect="auto")
 
     ax.set_xticks(range(len(page_refs)))
     ax.set_xticklabels(page_refs)
-    ax.set_yticks(range(len(history[0])))
-    ax.set_yticklabels([f"Frame {i+1}" for i in range(len(history[0]))])
+    ax.set_yticks(range(max_len))
+    ax.set_yticklabels([f"Frame {i+1}" for i in range(max_len)])
 
     ax.set_xlabel("Page References")
     ax.set_ylabel("Frames")
@@ -117,6 +168,10 @@ def run_simulation():
             history, hits, misses = lru_page_replacement(page_refs, num_frames)
         elif selected_algo == "Optimal":
             history, hits, misses = optimal_page_replacement(page_refs, num_frames)
+        elif selected_algo == "LFU":
+            history, hits, misses, _ = lfu_page_replacement(page_refs, num_frames)
+        elif selected_algo == "Clock":
+            history, hits, misses, _ = clock_page_replacement(page_refs, num_frames)
         else:
             messagebox.showerror("Error", "Invalid algorithm selected!")
             return
@@ -150,7 +205,7 @@ tk.Label(root, text="Page Replacement Algorithm Simulator", font=("Arial", 14, "
 # Algorithm Selection
 tk.Label(root, text="Select Algorithm:", bg="lightgray").pack()
 algo_var = tk.StringVar(value="FIFO")
-algo_menu = ttk.Combobox(root, textvariable=algo_var, values=["FIFO", "LRU", "Optimal"], state="readonly")
+algo_menu = ttk.Combobox(root, textvariable=algo_var, values=["FIFO", "LRU", "Optimal", "LFU", "Clock"], state="readonly")
 algo_menu.pack(pady=5)
 
 # Number of Frames
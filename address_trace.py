@@ -0,0 +1,118 @@
+import mmap
+import os
+import re
+import numpy as np
+
+from page_replacement_engines import STATS_ENGINES
+
+# ------------------ Address Trace Front End ------------------
+# Turns virtual-address traces into page references for the engines.
+#   lackey  Valgrind Lackey output: "I  0023C790,2", " L BE80199C,4", " S ...",
+#           " M ..."; other lines (==pid== banners) are skipped
+#   hex     one hexadecimal address per line, with or without 0x
+# Files are parsed in large blocks, addresses become pages with one vectorized
+# shift (page_size must be a power of two), and consecutive references to the
+# same page can be collapsed into (page, run length) pairs.
+#
+# A repeat of the page just referenced is a hit under every policy, and for
+# FIFO, LRU, Clock, Optimal and 2Q it leaves the state unchanged as well, so
+# those engines run on the collapsed trace and the repeats are credited as hits
+# in bulk. LFU (counts), ARC (T1 -> T2) and LIRS (HIR promotion) react to the
+# repeat, so they get the runs expanded back.
+
+BLOCK_BYTES = 1 << 24
+LACKEY_LINE = re.compile(rb"^ ?([ILSM]) +([0-9A-Fa-f]+),\d+", re.MULTILINE)
+HEX_LINE = re.compile(rb"^\s*(?:0[xX])?([0-9A-Fa-f]+)\s*$", re.MULTILINE)
+RUN_SAFE = {"FIFO", "LRU", "Clock", "Optimal", "2Q"}
+
+
+def page_shift(page_size):
+    if page_size <= 0 or page_size & (page_size - 1):
+        raise ValueError(f"page size must be a power of two, got {page_size}")
+    return page_size.bit_length() - 1
+
+
+def _blocks(path):
+    # Whole lines in blocks of about BLOCK_BYTES
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start, size = 0, len(mm)
+            while start < size:
+                end = min(start + BLOCK_BYTES, size)
+                if end < size:
+                    newline = mm.rfind(b"\n", start, end)
+                    end = newline + 1 if newline >= start else (mm.find(b"\n", end) + 1 or size)
+                yield mm[start:end]
+                start = end
+
+
+def iter_addresses(path, fmt="lackey", kinds="ILSM"):
+    # Yields uint64 arrays of addresses; kinds filters Lackey records (e.g. "LSM" for data only)
+    wanted = set(kinds.encode())
+    for block in _blocks(path):
+        if fmt == "lackey":
+            records = LACKEY_LINE.findall(block)
+            addresses = [int(address, 16) for kind, address in records if kind[0] in wanted]
+        elif fmt == "hex":
+            addresses = [int(address, 16) for address in HEX_LINE.findall(block)]
+        else:
+            raise ValueError(f"Unknown address trace format {fmt}")
+        if addresses:
+            yield np.array(addresses, dtype=np.uint64)
+
+
+def addresses_to_pages(addresses, page_size=4096):
+    return (np.asarray(addresses, dtype=np.uint64) >> np.uint64(page_shift(page_size))).astype(np.int64)
+
+
+def collapse_runs(pages):
+    # (run pages, run lengths) for one array of pages
+    pages = np.asarray(pages)
+    if pages.size == 0:
+        return pages, np.empty(0, dtype=np.int64)
+    starts = np.flatnonzero(np.concatenate(([True], pages[1:] != pages[:-1])))
+    return pages[starts], np.diff(np.append(starts, pages.size))
+
+
+def iter_address_pages(path, page_size=4096, fmt="lackey", kinds="ILSM", collapse=False):
+    # Page chunks from an address trace; with collapse, (pages, counts) chunks
+    # whose runs never continue into the next chunk
+    shift_pages = (addresses_to_pages(a, page_size) for a in iter_addresses(path, fmt, kinds))
+    if not collapse:
+        yield from shift_pages
+        return
+
+    held_page, held_count = None, 0  # Last run of the previous chunk, possibly unfinished
+    for pages in shift_pages:
+        runs, counts = collapse_runs(pages)
+        if held_page is not None:
+            if runs[0] == held_page:
+                counts[0] += held_count
+            else:
+                runs, counts = np.insert(runs, 0, held_page), np.insert(counts, 0, held_count)
+        held_page, held_count = runs[-1], counts[-1]
+        if len(runs) > 1:
+            yield runs[:-1], counts[:-1]
+    if held_page is not None:
+        yield np.array([held_page]), np.array([held_count])
+
+
+def load_address_pages(path, page_size=4096, fmt="lackey", kinds="ILSM", collapse=False):
+    # Whole trace as one pages array, or (pages, counts) when collapsed
+    chunks = list(iter_address_pages(path, page_size, fmt, kinds, collapse))
+    if not collapse:
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+    if not chunks:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate([p for p, _ in chunks]), np.concatenate([c for _, c in chunks])
+
+
+def collapsed_page_stats(algorithm, pages, counts, frames, monitor=None):
+    # (hits, misses, evictions[, ghost_hits]) for the expanded trace
+    if algorithm not in RUN_SAFE:
+        return STATS_ENGINES[algorithm](np.repeat(pages, counts).tolist(), frames, monitor)
+    result = STATS_ENGINES[algorithm](np.asarray(pages).tolist(), frames, monitor)
+    repeats = int(np.sum(counts)) - len(pages)
+    return (result[0] + repeats,) + tuple(result[1:])
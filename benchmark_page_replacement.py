@@ -0,0 +1,163 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import numpy as np
+
+from instrumentation import peak_memory
+from page_replacement_engines import REPLACEMENT_ENGINES, STATS_ENGINES
+
+# ------------------ Synthetic Workloads ------------------
+# Every generator is deterministic for a given (size, seed) and returns a list
+# of Python ints, the input the engines are fastest on.
+
+def uniform_trace(size, seed, pages=1000):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, pages, size).tolist()
+
+
+def zipf_trace(size, seed, pages=1000, skew=1.0):
+    # Finite Zipf: page rank k is drawn with probability proportional to 1 / k^skew
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, pages + 1) ** skew
+    ranks = rng.choice(pages, size, p=weights / weights.sum())
+    return rng.permutation(pages)[ranks].tolist()  # Hot pages get scattered ids
+
+
+def loop_trace(size, seed, loop=300):
+    # Cyclic scan; defeats LRU and FIFO whenever loop > frames
+    start = int(np.random.default_rng(seed).integers(0, loop))
+    return ((np.arange(size) + start) % loop).tolist()
+
+
+def phase_trace(size, seed, working_set=200, phases=8, pages=5000):
+    # Uniform references inside a working set that jumps to a new region each phase
+    rng = np.random.default_rng(seed)
+    bases = rng.integers(0, pages - working_set, phases)
+    phase = np.arange(size) * phases // max(size, 1)
+    return (bases[phase] + rng.integers(0, working_set, size)).tolist()
+
+
+def scan_hot_trace(size, seed, hot=64, hot_fraction=0.7):
+    # A sequential scan over cold pages interleaved with references to a small hot set
+    rng = np.random.default_rng(seed)
+    is_hot = rng.random(size) < hot_fraction
+    scan = hot + np.cumsum(~is_hot)  # Cold pages are numbered after the hot set
+    return np.where(is_hot, rng.integers(0, hot, size), scan).tolist()
+
+
+WORKLOADS = {
+    "uniform": uniform_trace,
+    "zipf": zipf_trace,
+    "loop": loop_trace,
+    "phase": phase_trace,
+    "scan_hot": scan_hot_trace,
+}
+
+# ------------------ Engines Under Test ------------------
+ENGINES = dict(REPLACEMENT_ENGINES)
+ENGINES.update({f"{name} stats": engine for name, engine in STATS_ENGINES.items()})
+
+
+def result_counts(result):
+    # Full engines return (history, hits, misses, ...), stats engines (hits, misses, ...)
+    if isinstance(result[0], int):
+        return result[0], result[1]
+    return result[1], result[2]
+
+
+# ------------------ Benchmark Runner ------------------
+def time_engine(engine, pages, frames, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = engine(pages, frames)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_benchmarks(workloads, sizes, frame_counts, engines, seed=0, repeat=3, measure_memory=True):
+    rows = []
+    for workload in workloads:
+        for size in sizes:
+            pages = WORKLOADS[workload](size, seed)
+            for frames in frame_counts:
+                for name in engines:
+                    seconds, result = time_engine(ENGINES[name], pages, frames, repeat)
+                    hits, misses = result_counts(result)
+                    rows.append({
+                        "workload": workload,
+                        "size": size,
+                        "frames": frames,
+                        "engine": name,
+                        "faults": misses,
+                        "hits": hits,
+                        "seconds": seconds,
+                        "refs_per_sec": size / seconds if seconds else None,
+                        # Separate run: tracemalloc slows allocation-heavy engines down too much to time them
+                        "peak_bytes": peak_memory(ENGINES[name], pages, frames) if measure_memory else None,
+                    })
+                    print(format_row(rows[-1]), flush=True)
+    return rows
+
+
+def format_row(row):
+    rate = f"{row['refs_per_sec']:>12,.0f}" if row["refs_per_sec"] else f"{'-':>12}"
+    memory = f"{row['peak_bytes'] / 2**20:>9.1f}" if row["peak_bytes"] is not None else f"{'-':>9}"
+    return (f"{row['workload']:<9} {row['size']:>9} {row['frames']:>6} {row['engine']:<14} "
+            f"{row['faults']:>9} {rate} {memory}")
+
+
+def compare(rows, baseline_rows):
+    # Speed ratio against a previous JSON report; > 1 means faster than the baseline
+    key = lambda r: (r["workload"], r["size"], r["frames"], r["engine"])
+    baseline = {key(r): r for r in baseline_rows}
+    for row in rows:
+        old = baseline.get(key(row))
+        if old is None or not old["refs_per_sec"] or not row["refs_per_sec"]:
+            continue
+        ratio = row["refs_per_sec"] / old["refs_per_sec"]
+        faults = "" if old["faults"] == row["faults"] else f"  FAULTS CHANGED {old['faults']} -> {row['faults']}"
+        print(f"{row['workload']:<9} {row['size']:>9} {row['frames']:>6} {row['engine']:<14} {ratio:>6.2f}x{faults}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the page replacement engines on synthetic traces.")
+    parser.add_argument("--workloads", nargs="+", default=list(WORKLOADS), choices=list(WORKLOADS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 100_000])
+    parser.add_argument("--frames", nargs="+", type=int, default=[16, 256])
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case; the best is kept")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory run")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="previous JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    print(f"{'Workload':<9} {'Refs':>9} {'Frames':>6} {'Engine':<14} {'Faults':>9} {'Refs/sec':>12} {'Peak MiB':>9}")
+    rows = run_benchmarks(args.workloads, args.sizes, args.frames, args.engines,
+                          seed=args.seed, repeat=args.repeat, measure_memory=not args.no_memory)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": rows,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            print("\nSpeed vs baseline:")
+            compare(rows, json.load(f)["results"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+from array import array
+from bisect import bisect_right
+
+# ------------------ Compact Frame History ------------------
+# Instead of copying the whole frame list on every reference, the engines log
+# one (step, slot, new_page) event per change. The frame state at any step is
+# rebuilt from the nearest checkpoint, which is taken every `checkpoint_interval`
+# events, so random access stays cheap while memory grows only with the faults.
+
+
+class FrameHistory:
+    def __init__(self, frames, checkpoint_interval=None):
+        self.frames = frames
+        self.checkpoint_interval = checkpoint_interval or max(256, frames)
+        self.steps = array('q')  # Step of each event
+        self.slots = array('i')  # Frame slot written by each event
+        self.pages = array('q')  # Page loaded by each event
+        self.length = 0  # Number of recorded steps
+        self._state = []  # Frame contents after the last event
+        self._checkpoints = [array('q')]  # State before events 0, K, 2K, ...
+
+    def record(self, step, slot, page):
+        # Slots are filled in order, so slot == len(state) means a cold fill
+        if slot == len(self._state):
+            self._state.append(page)
+        else:
+            self._state[slot] = page
+        self.steps.append(step)
+        self.slots.append(slot)
+        self.pages.append(page)
+        if len(self.steps) % self.checkpoint_interval == 0:
+            self._checkpoints.append(array('q', self._state))
+        if step >= self.length:
+            self.length = step + 1
+
+    @classmethod
+    def from_events(cls, frames, steps, slots, pages, length):
+        # Rebuild a history (checkpoints included) from saved event arrays
+        history = cls(frames)
+        for step, slot, page in zip(steps, slots, pages):
+            history.record(step, slot, page)
+        history.finish(length)
+        return history
+
+    def finish(self, steps):
+        # Trailing hits add steps without adding events
+        self.length = max(self.length, steps)
+
+    @property
+    def occupied(self):
+        return len(self._state)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, step):
+        if step < 0:
+            step += self.length
+        if not 0 <= step < self.length:
+            raise IndexError("history step out of range")
+
+        end = bisect_right(self.steps, step)  # Events applied up to this step
+        start = (end // self.checkpoint_interval) * self.checkpoint_interval
+        state = list(self._checkpoints[start // self.checkpoint_interval])
+        for e in range(start, end):
+            slot = self.slots[e]
+            if slot == len(state):
+                state.append(self.pages[e])
+            else:
+                state[slot] = self.pages[e]
+        return state
+
+    def __iter__(self):
+        return self.window(0, self.length)
+
+    def window(self, start, stop):
+        # Sequential replay of steps [start, stop): one lookup, then one pass over
+        # the events in the range
+        stop = min(stop, self.length)
+        if start >= stop:
+            return
+        state = self[start]
+        yield list(state)
+        e, num_events = bisect_right(self.steps, start), len(self.steps)
+        for step in range(start + 1, stop):
+            while e < num_events and self.steps[e] == step:
+                slot = self.slots[e]
+                if slot == len(state):
+                    state.append(self.pages[e])
+                else:
+                    state[slot] = self.pages[e]
+                e += 1
+            yield list(state)
@@ -0,0 +1,114 @@
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+
+# ------------------ Engine Instrumentation ------------------
+# Opt-in profiling around a single engine call. Nothing is added to the engines'
+# inner loops: the counters are derived from what every engine already returns
+# (one eviction per fault position or stats eviction, one history write per
+# recorded event), so leaving profiling off
+# costs nothing. Peak memory uses tracemalloc, which slows allocation-heavy
+# engines down, so it is a separate switch, and the peak is taken from a second,
+# untimed run so the wall/CPU figures are never measured under tracemalloc.
+
+
+@dataclass
+class EngineProfile:
+    algorithm: str
+    frames: int
+    mode: str  # "full" or "stats"
+    references: int
+    wall_seconds: float
+    cpu_seconds: float
+    refs_per_sec: float
+    evictions: int
+    history_writes: int
+    peak_bytes: int = None  # Only with trace_memory
+
+    def to_dict(self):
+        return asdict(self)
+
+    def summary(self):
+        text = (f"Wall {self.wall_seconds:.4f}s, CPU {self.cpu_seconds:.4f}s, "
+                f"{self.refs_per_sec:,.0f} refs/s\n"
+                f"Evictions {self.evictions}, History Writes {self.history_writes}")
+        if self.peak_bytes is not None:
+            text += f"\nPeak Memory {self.peak_bytes / 2**20:.2f} MiB"
+        return text
+
+
+def peak_memory(engine, pages, frames):
+    # tracemalloc peak of one engine call, in bytes
+    tracemalloc.start()
+    try:
+        engine(pages, frames)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def profile_engine(engine, pages, frames, algorithm, mode, trace_memory=False, monitor=None, fresh_pages=None):
+    # Runs engine(pages, frames, monitor) and returns (result, EngineProfile);
+    # with trace_memory the engine runs again under tracemalloc for the peak, on
+    # fresh_pages() if given (for one-shot iterators) or else on pages again
+    wall, cpu = time.perf_counter(), time.process_time()
+    result = engine(pages, frames, monitor)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    peak = peak_memory(engine, fresh_pages() if fresh_pages else pages, frames) if trace_memory else None
+
+    if mode == "full":
+        history, hits, misses, fault_positions = result[:4]
+        evictions, history_writes = len(fault_positions), len(history.steps)
+    else:
+        hits, misses, evictions = result[:3]
+        history_writes = 0
+    references = hits + misses
+
+    profile = EngineProfile(
+        algorithm=algorithm,
+        frames=frames,
+        mode=mode,
+        references=references,
+        wall_seconds=wall,
+        cpu_seconds=cpu,
+        refs_per_sec=references / wall if wall else 0.0,
+        evictions=evictions,
+        history_writes=history_writes,
+        peak_bytes=peak,
+    )
+    return result, profile
+
+
+class Profiler:
+    # Collects one EngineProfile per engine call routed through run()
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.profiles = []
+
+    def run(self, engine, pages, frames, algorithm, mode, monitor=None, fresh_pages=None):
+        result, profile = profile_engine(engine, pages, frames, algorithm, mode, self.trace_memory, monitor,
+                                         fresh_pages)
+        self.profiles.append(profile)
+        return result
+
+    def get(self, algorithm, frames=None):
+        # Latest profile of an algorithm (at a frame count), or None
+        for profile in reversed(self.profiles):
+            if profile.algorithm == algorithm and frames in (None, profile.frames):
+                return profile
+        return None
+
+    def to_dict(self):
+        return {"trace_memory": self.trace_memory, "profiles": [p.to_dict() for p in self.profiles]}
+
+    def report(self):
+        lines = [f"{'Algorithm':<10} {'Frames':>7} {'Mode':<6} {'Wall (s)':>9} {'CPU (s)':>9} "
+                 f"{'Refs/sec':>12} {'Evictions':>10} {'Writes':>9} {'Peak MiB':>9}"]
+        lines.append("-" * len(lines[0]))
+        for p in self.profiles:
+            memory = f"{p.peak_bytes / 2**20:>9.2f}" if p.peak_bytes is not None else f"{'-':>9}"
+            lines.append(
+                f"{p.algorithm:<10} {p.frames:>7} {p.mode:<6} {p.wall_seconds:>9.4f} {p.cpu_seconds:>9.4f} "
+                f"{p.refs_per_sec:>12,.0f} {p.evictions:>10} {p.history_writes:>9} {memory}"
+            )
+        return "\n".join(lines)
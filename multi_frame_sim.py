@@ -0,0 +1,132 @@
+import numpy as np
+
+from page_replacement_engines import CHECK_INTERVAL
+
+# ------------------ All Frame Counts at Once (FIFO / Clock) ------------------
+# FIFO and Clock are not stack algorithms, so no single stack-distance pass gives
+# their faults for every frame count. Instead, caches of every size 1..K are
+# simulated side by side: row k-1 of each array is the cache with k frames, and
+# every reference updates all K rows with a handful of NumPy operations instead
+# of K Python-level engine loops.
+#
+# slot_of[page, k-1] is the slot holding page in the k-frame cache (-1 if not
+# resident), so the per-reference membership test is one row read. That matrix
+# takes distinct_pages * K * 2 bytes (4 once K exceeds 32767).
+
+SWEEP_WINDOW = 16  # Clock slots examined by the first vectorized sweep step
+
+
+def _dense_ids(pages):
+    pages = np.asarray(pages)
+    if pages.size == 0:
+        return [], 0
+    distinct, ids = np.unique(pages, return_inverse=True)
+    return ids.tolist(), len(distinct)
+
+
+def _state(distinct, max_frames):
+    # Two-dimensional arrays are indexed through flat views (row * max_frames +
+    # column), which NumPy gathers and scatters much faster than index pairs
+    index_type = np.int16 if max_frames <= np.iinfo(np.int16).max else np.int32
+    slot_of = np.full((distinct, max_frames), -1, dtype=index_type)
+    slots = np.full(max_frames * max_frames, -1, dtype=np.int64)  # Page in each slot; -1 empty
+    sizes = np.arange(1, max_frames + 1)
+    row_start = np.arange(max_frames) * max_frames  # Flat offset of each cache's row
+    return slot_of, slot_of.reshape(-1), slots, sizes, row_start
+
+
+def fifo_fault_curve(pages, max_frames, monitor=None):
+    # faults[k-1] == fifo_page_stats(pages, k)[1] for k = 1..max_frames.
+    # Empty slots come first in pointer order, so one FIFO pointer per cache
+    # covers both the cold fill and replacement.
+    ids, distinct = _dense_ids(pages)
+    slot_of, slot_of_flat, slots, sizes, row_start = _state(distinct, max_frames)
+    pointer = np.zeros(max_frames, dtype=np.int64)
+    faults = np.zeros(max_frames, dtype=np.int64)
+
+    for i, page in enumerate(ids):
+        if monitor is not None and i % CHECK_INTERVAL == 0:
+            monitor.tick(i)
+        miss = np.flatnonzero(slot_of[page] < 0)  # Caches (k - 1) that fault
+        if not miss.size:
+            continue
+        faults[miss] += 1
+        slot = pointer.take(miss)
+        cells = row_start.take(miss) + slot
+        victims = slots.take(cells)
+        loaded = victims >= 0
+        slot_of_flat[victims[loaded] * max_frames + miss[loaded]] = -1
+        slots[cells] = page
+        slot_of_flat[page * max_frames + miss] = slot
+        slot += 1
+        slot[slot == sizes.take(miss)] = 0
+        pointer[miss] = slot
+
+    return faults.tolist()
+
+
+def clock_fault_curve(pages, max_frames, monitor=None):
+    # faults[k-1] == clock_page_stats(pages, k)[1] for k = 1..max_frames.
+    # Empty slots have a clear reference bit and lie ahead of the hand, so the
+    # sweep fills them in order just like the sequential engine's cold fill.
+    ids, distinct = _dense_ids(pages)
+    slot_of, slot_of_flat, slots, sizes, row_start = _state(distinct, max_frames)
+    ref_bits = np.zeros(max_frames * max_frames, dtype=bool)
+    hand = np.zeros(max_frames, dtype=np.int64)
+    faults = np.zeros(max_frames, dtype=np.int64)
+    all_offsets = np.arange(max(max_frames, SWEEP_WINDOW))
+
+    for i, page in enumerate(ids):
+        if monitor is not None and i % CHECK_INTERVAL == 0:
+            monitor.tick(i)
+        row = slot_of[page]
+        resident = row >= 0
+        hit = np.flatnonzero(resident)
+        ref_bits[row_start.take(hit) + row.take(hit)] = True
+        miss = np.flatnonzero(~resident)
+        if not miss.size:
+            continue
+        faults[miss] += 1
+
+        # Sweep all faulting caches together: each hand stops at the first clear
+        # bit in a window ahead of it, clearing the set bits it passes; hands that
+        # find none clear the window and go on with a window twice as wide, so a
+        # long sweep costs O(log) steps. A window never runs past the cache size,
+        # where the slot at the hand (cleared a full cycle ago) is the victim, as
+        # in the sequential sweep.
+        sweeping, width = miss, SWEEP_WINDOW
+        while sweeping.size:
+            offsets = all_offsets[:width]
+            size = sizes.take(sweeping)[:, None]
+            cells = (hand.take(sweeping)[:, None] + offsets) % size + row_start.take(sweeping)[:, None]
+            window = ref_bits.take(cells) & (offsets < size)
+            found = ~window.all(axis=1)
+            stop = np.where(found, np.argmin(window, axis=1), width)  # First clear bit
+            ref_bits[cells[offsets < stop[:, None]]] = False
+            hand[sweeping] = (hand.take(sweeping) + stop) % size[:, 0]
+            sweeping, width = sweeping[~found], width * 2
+
+        slot = hand.take(miss)
+        cells = row_start.take(miss) + slot
+        victims = slots.take(cells)
+        loaded = victims >= 0
+        slot_of_flat[victims[loaded] * max_frames + miss[loaded]] = -1
+        slots[cells] = page
+        slot_of_flat[page * max_frames + miss] = slot
+        ref_bits[cells] = True
+        slot += 1
+        slot[slot == sizes.take(miss)] = 0
+        hand[miss] = slot
+
+    return faults.tolist()
+
+
+FAULT_CURVES = {
+    "FIFO": fifo_fault_curve,
+    "Clock": clock_fault_curve,
+}
+
+
+def belady_anomalies(faults):
+    # Frame counts k where k frames fault more than k - 1 frames
+    return [k for k in range(2, len(faults) + 1) if faults[k - 1] > faults[k - 2]]
@@ -0,0 +1,208 @@
+import heapq
+
+from page_replacement_engines import CHECK_INTERVAL, RESUMABLE_POLICIES, STATS_ENGINES, optimal_page_replacement
+
+# ------------------ Multi-Process Memory Model ------------------
+# Several processes share `frames` physical frames. The input is a sequence of
+# (pid, page) references in global time order; pages of different processes are
+# distinct even when their numbers match.
+#   global        one policy over every (pid, page); a fault may evict another process's page
+#   equal         local replacement, the frames split evenly between processes
+#   proportional  local replacement, the frames split by process size (distinct pages)
+#   pff           local replacement; page-fault frequency moves frames between processes
+# Fixed local allocations never interact, so each process is one run of the
+# ordinary stats engine on its own references (Optimal included). Global and PFF
+# replay the interleaving through the resumable policies; global Optimal runs
+# optimal_page_replacement on dense ids and reads the owners off its history.
+#
+# Every mode returns {"allocation", "algorithm", "frames", "references",
+# "faults", "processes"}, where processes maps pid -> {"references", "faults",
+# "frames", "evicted"}: frames is the final allocation (resident pages for
+# global) and evicted counts the process's pages pushed out by replacement.
+
+ALLOCATIONS = ["global", "equal", "proportional", "pff"]
+
+
+def _tagged(pid, trace):
+    for timestamp, page in trace:
+        yield timestamp, pid, page
+
+
+def merge_timestamped(traces):
+    # traces: pid -> iterable of (timestamp, page), each in time order. Yields the
+    # interleaved (pid, page) stream; equal timestamps go in pid order.
+    for _, pid, page in heapq.merge(*(_tagged(pid, trace) for pid, trace in traces.items())):
+        yield pid, page
+
+
+def split_by_process(refs):
+    # pid -> that process's references in order, pids in order of first reference
+    per_process = {}
+    for pid, page in refs:
+        pages = per_process.get(pid)
+        if pages is None:
+            pages = per_process[pid] = []
+        pages.append(page)
+    return per_process
+
+
+def allocate_frames(frames, weights):
+    # Split frames in proportion to weights (pid -> weight), at least one each,
+    # handing leftover frames out by largest remainder
+    if frames < len(weights):
+        raise ValueError(f"{frames} frames cannot give each of {len(weights)} processes a frame")
+    total = sum(weights.values())
+    quotas = {pid: frames * w / total for pid, w in weights.items()}
+    allocation = {pid: max(1, int(q)) for pid, q in quotas.items()}
+    spare = frames - sum(allocation.values())
+    by_remainder = sorted(quotas, key=lambda pid: allocation[pid] - quotas[pid])
+    for pid in by_remainder[:max(spare, 0)]:
+        allocation[pid] += 1
+    while spare < 0:  # The one-frame minimum overdrew: take back from the largest
+        pid = max(allocation, key=allocation.get)
+        allocation[pid] -= 1
+        spare += 1
+    return allocation
+
+
+def _report(allocation, algorithm, frames, processes):
+    return {
+        "allocation": allocation,
+        "algorithm": algorithm,
+        "frames": frames,
+        "references": sum(p["references"] for p in processes.values()),
+        "faults": sum(p["faults"] for p in processes.values()),
+        "processes": processes,
+    }
+
+
+def simulate_local(refs, frames, algorithm="LRU", allocation="equal", monitor=None):
+    per_process = split_by_process(refs)
+    if allocation == "equal":
+        weights = dict.fromkeys(per_process, 1)
+    else:
+        weights = {pid: len(set(pages)) for pid, pages in per_process.items()}
+    shares = allocate_frames(frames, weights)
+
+    engine = STATS_ENGINES[algorithm]
+    processes, done = {}, 0
+    for pid, pages in per_process.items():
+        if monitor is not None:
+            monitor.tick(done)
+        hits, misses, evictions = engine(pages, shares[pid])[:3]
+        processes[pid] = {"references": len(pages), "faults": misses, "frames": shares[pid], "evicted": evictions}
+        done += len(pages)
+    return _report(allocation, algorithm, frames, processes)
+
+
+def _global_optimal(refs, frames, monitor=None):
+    key_id, owner_of, ids = {}, [], []  # (pid, page) -> dense id, id -> pid
+    processes = {}
+    for pid, page in refs:
+        key = (pid, page)
+        kid = key_id.get(key)
+        if kid is None:
+            kid = key_id[key] = len(owner_of)
+            owner_of.append(pid)
+        ids.append(kid)
+        stats = processes.get(pid)
+        if stats is None:
+            stats = processes[pid] = {"references": 0, "faults": 0, "frames": 0, "evicted": 0}
+        stats["references"] += 1
+
+    history = optimal_page_replacement(ids, frames, monitor)[0]
+    slot_page = []  # Dense id held by each slot while replaying the events
+    for slot, kid in zip(history.slots, history.pages):
+        stats = processes[owner_of[kid]]
+        stats["faults"] += 1
+        stats["frames"] += 1
+        if slot == len(slot_page):
+            slot_page.append(kid)
+        else:
+            owner = processes[owner_of[slot_page[slot]]]
+            owner["frames"] -= 1
+            owner["evicted"] += 1
+            slot_page[slot] = kid
+    return _report("global", "Optimal", frames, processes)
+
+
+def simulate_global(refs, frames, algorithm="LRU", monitor=None):
+    if algorithm == "Optimal":
+        return _global_optimal(refs, frames, monitor)
+    access = RESUMABLE_POLICIES[algorithm](frames).access
+    processes = {}
+
+    for i, (pid, page) in enumerate(refs):
+        if monitor is not None and i % CHECK_INTERVAL == 0:
+            monitor.tick(i)
+        stats = processes.get(pid)
+        if stats is None:
+            stats = processes[pid] = {"references": 0, "faults": 0, "frames": 0, "evicted": 0}
+        stats["references"] += 1
+        hit, victim = access((pid, page))
+        if not hit:
+            stats["faults"] += 1
+            stats["frames"] += 1
+            if victim is not None:
+                owner = processes[victim[0]]
+                owner["frames"] -= 1
+                owner["evicted"] += 1
+
+    return _report("global", algorithm, frames, processes)
+
+
+def simulate_pff(refs, frames, algorithm="LRU", window=256, lower=0.02, upper=0.10, monitor=None):
+    # Page-fault frequency control. Every `window` references of a process its
+    # fault rate is checked: above `upper` it takes up to a quarter more frames
+    # from the free pool, below `lower` it returns an eighth of its frames (at
+    # least one, keeping one), evicting pages as its policy chooses. Processes
+    # start from an equal split; frames of processes that have not started yet
+    # stay reserved for them.
+    policy_class = RESUMABLE_POLICIES[algorithm]
+    if not hasattr(policy_class, "resize"):
+        raise ValueError(f"PFF needs a policy that can change its frame count (FIFO, LRU, LFU), not {algorithm}")
+    refs = refs if isinstance(refs, list) else list(refs)
+    shares = allocate_frames(frames, dict.fromkeys((pid for pid, _ in refs), 1))
+    free = 0
+    policies = {pid: policy_class(share) for pid, share in shares.items()}
+    processes = {pid: {"references": 0, "faults": 0, "frames": share, "evicted": 0} for pid, share in shares.items()}
+    window_faults = dict.fromkeys(shares, 0)
+
+    for i, (pid, page) in enumerate(refs):
+        if monitor is not None and i % CHECK_INTERVAL == 0:
+            monitor.tick(i)
+        stats = processes[pid]
+        stats["references"] += 1
+        hit, victim = policies[pid].access(page)
+        if not hit:
+            stats["faults"] += 1
+            window_faults[pid] += 1
+            if victim is not None:
+                stats["evicted"] += 1
+
+        if stats["references"] % window == 0:
+            rate = window_faults[pid] / window
+            window_faults[pid] = 0
+            held = stats["frames"]
+            if rate > upper and free:
+                grant = min(free, max(1, held // 4))
+                free -= grant
+                stats["frames"] = held + grant
+                policies[pid].resize(held + grant)
+            elif rate < lower and held > 1:
+                release = min(held - 1, max(1, held // 8))
+                free += release
+                stats["frames"] = held - release
+                stats["evicted"] += len(policies[pid].resize(held - release))
+
+    return _report("pff", algorithm, frames, processes)
+
+
+def simulate_processes(refs, frames, algorithm="LRU", allocation="global", monitor=None, **pff_options):
+    if allocation == "global":
+        return simulate_global(refs, frames, algorithm, monitor)
+    if allocation == "pff":
+        return simulate_pff(refs, frames, algorithm, monitor=monitor, **pff_options)
+    if allocation in ("equal", "proportional"):
+        return simulate_local(refs, frames, algorithm, allocation, monitor)
+    raise ValueError(f"Unknown allocation {allocation}")
@@ -0,0 +1,111 @@
+import os
+import tempfile
+import numpy as np
+
+from page_replacement_engines import NextUseOptimal
+from trace_loader import DEFAULT_CHUNK, iter_trace_chunks, map_trace, trace_format, write_int64_trace
+
+# ------------------ Out-of-Core Optimal ------------------
+# optimal_page_stats needs the whole trace and a next-use array of the same
+# length in memory. Here both live in files instead:
+#   1. a backward pass over the (memory-mapped) trace writes next_use[i] to a
+#      memory-mapped int64 file, one chunk at a time, remembering only the
+#      earliest position seen so far of every distinct page;
+#   2. forward passes stream the trace and next_use chunk by chunk through
+#      NextUseOptimal, the lazy-heap loop behind optimal_page_stats.
+# Process memory is then bounded by the chunk size, the distinct pages (backward
+# pass) and the frames (forward pass); the files go through the page cache.
+# Text traces are first spilled to a temporary int64 file so they can be read
+# backwards. The next-use file is built once and reused for every frame count.
+
+
+class OutOfCoreTrace:
+    def __init__(self, path, fmt=None, chunk_size=DEFAULT_CHUNK, directory=None):
+        self.chunk_size = chunk_size
+        self._temp_paths = []
+        if trace_format(path, fmt) == "binary":
+            self.pages = map_trace(path)
+        else:
+            spilled = write_int64_trace(iter_trace_chunks(path, chunk_size, fmt), directory)
+            self._temp_paths.append(spilled)
+            self.pages = map_trace(spilled)
+
+        fd, next_path = tempfile.mkstemp(suffix=".next.i64", dir=directory)
+        os.close(fd)
+        self._temp_paths.append(next_path)
+        self.next_use = self._build_next_use(next_path)
+
+    @classmethod
+    def from_chunks(cls, chunks, chunk_size=DEFAULT_CHUNK, directory=None):
+        # For page sources that are not trace files (e.g. decoded address traces)
+        spilled = write_int64_trace(chunks, directory)
+        trace = cls(spilled, "binary", chunk_size, directory)
+        trace._temp_paths.append(spilled)
+        return trace
+
+    def __len__(self):
+        return len(self.pages)
+
+    def chunks(self):
+        # The (memory-mapped) trace, chunk by chunk
+        for start in range(0, len(self.pages), self.chunk_size):
+            yield self.pages[start:start + self.chunk_size]
+
+    def _build_next_use(self, path):
+        n = len(self.pages)
+        if n == 0:
+            return np.empty(0, dtype=np.int64)
+        next_use = np.memmap(path, dtype=np.int64, mode="w+", shape=(n,))
+        first_seen = {}  # page -> earliest position in the chunks processed so far
+
+        for end in range(n, 0, -self.chunk_size):
+            start = max(0, end - self.chunk_size)
+            chunk = np.asarray(self.pages[start:end], dtype=np.int64)
+            # Sorting by page (stably) puts each page's positions in order, so
+            # within the chunk the next use of a position is the one after it
+            order = np.argsort(chunk, kind="stable")
+            ordered = chunk[order]
+            same = ordered[1:] == ordered[:-1]
+            result = np.empty(len(chunk), dtype=np.int64)
+            result[order[:-1]] = np.where(same, order[1:] + start, 0)
+
+            # The last position of each page in the chunk continues into later chunks
+            group_start = np.flatnonzero(np.concatenate(([True], ~same)))
+            group_end = np.flatnonzero(np.concatenate((~same, [True])))
+            uniques = ordered[group_start].tolist()
+            result[order[group_end]] = [first_seen.get(page, n) for page in uniques]
+            first_seen.update(zip(uniques, (order[group_start] + start).tolist()))
+
+            next_use[start:end] = result
+        next_use.flush()
+        return next_use
+
+    def optimal_stats(self, frames, monitor=None):
+        # Same result as optimal_page_stats(pages, frames): (hits, misses, evictions)
+        optimal = NextUseOptimal(frames)
+        for start in range(0, len(self.pages), self.chunk_size):
+            pages = self.pages[start:start + self.chunk_size].tolist()
+            next_uses = self.next_use[start:start + self.chunk_size].tolist()
+            optimal.feed(zip(pages, next_uses), monitor)
+        return optimal.stats()
+
+    def close(self):
+        # Drop the maps before deleting their files
+        self.pages = self.next_use = None
+        for path in self._temp_paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._temp_paths = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def optimal_page_stats_out_of_core(path, frames, fmt=None, chunk_size=DEFAULT_CHUNK, directory=None, monitor=None):
+    with OutOfCoreTrace(path, fmt, chunk_size, directory) as trace:
+        return trace.optimal_stats(frames, monitor)
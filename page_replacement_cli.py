@@ -0,0 +1,556 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from page_replacement_engines import ALGORITHMS, REPLACEMENT_ENGINES, STATS_ENGINES
+
+# Headless entry point. Engines come from page_replacement_engines, which has no
+# GUI dependencies; the trace loader (NumPy), the plots (matplotlib) and the Tk
+# simulator are imported only when --trace, --plot or --gui ask for them.
+#
+#   python page_replacement_cli.py --algo LRU ARC --frames 64 256 --trace refs.i32 --json
+#   python page_replacement_cli.py --frames 16 64 256 1024 --trace refs.i32 --workers 8
+#   python page_replacement_cli.py --frames 3 --pages "7 0 1 2 0 3 0 4 2 3"
+#   python page_replacement_cli.py --frames 64 --trace lackey.out --addresses lackey --collapse-repeats
+#   python page_replacement_cli.py --algo LRU --frames 64 --trace refs.i32 --save-results runs/
+#   python page_replacement_cli.py --replay runs/LRU-64.prr
+
+
+def page_source(args):
+    # Returns a callable giving a fresh page iterable for every run, so a trace
+    # file is streamed once per (algorithm, frames) instead of held in memory.
+    # Address traces are parsed on first use and kept as a page array.
+    if args.trace and args.addresses:
+        from address_trace import load_address_pages
+        loaded = []
+
+        def address_pages():
+            if not loaded:
+                loaded.append(load_address_pages(args.trace, args.page_size, args.addresses, args.access_kinds))
+            return loaded[0].tolist()
+        return address_pages
+    if args.trace:
+        from trace_loader import iter_trace_pages
+        return lambda: iter_trace_pages(args.trace, fmt=args.format)
+    pages = list(map(int, args.pages.split()))
+    return lambda: pages
+
+
+def make_row(algo, frames, hits, misses, evictions, ghost_hits, seconds):
+    total = hits + misses
+    return {
+        "algorithm": algo,
+        "frames": frames,
+        "references": total,
+        "hits": hits,
+        "misses": misses,
+        "evictions": evictions,
+        "hit_ratio": hits / total if total else 0.0,
+        "miss_ratio": misses / total if total else 0.0,
+        "ghost_hits": ghost_hits,
+        "seconds": seconds,
+    }
+
+
+def run(algorithms, frame_counts, pages, keep_history=None, cache=None, digest=None, profiler=None,
+        stats_engines=STATS_ENGINES):
+    # One row per (algorithm, frames); keep_history names the algorithm whose
+    # full result (history, fault positions) is wanted for plotting. With a
+    # profiler every engine runs (no cache reads) and each row gets its profile.
+    def compute(algo, frames, mode):
+        engine = REPLACEMENT_ENGINES[algo] if mode == "full" else stats_engines[algo]
+        if profiler is not None:
+            result = profiler.run(engine, pages(), frames, algo, mode, fresh_pages=pages)
+            if cache is not None:
+                cache.put(digest, frames, algo, mode, result)
+            return result
+        if cache is None:
+            return engine(pages(), frames)
+        return cache.fetch(digest, frames, algo, mode, lambda: engine(pages(), frames))
+
+    rows, detail = [], None
+    for algo in algorithms:
+        for frames in frame_counts:
+            start = time.perf_counter()
+            if algo == keep_history:
+                detail = compute(algo, frames, "full")
+                hits, misses = detail[1:3]
+                evictions, ghost_hits = len(detail[3]), detail[4] if len(detail) > 4 else None
+            else:
+                result = compute(algo, frames, "stats")
+                hits, misses, evictions = result[:3]
+                ghost_hits = result[3] if len(result) > 3 else None
+            rows.append(make_row(algo, frames, hits, misses, evictions, ghost_hits, time.perf_counter() - start))
+            if profiler is not None:
+                rows[-1]["profile"] = profiler.profiles[-1].to_dict()
+    return rows, detail
+
+
+def parallel_rows(algorithms, frame_counts, pages, args):
+    # The stats-only grid fanned out over a process pool (parallel_sweep)
+    from parallel_sweep import sweep
+
+    trace = args.trace if args.trace and not args.addresses else list(pages())
+    rows = []
+    for algo, frames, result, seconds in sweep(trace, frame_counts, algorithms, args.workers, args.format):
+        rows.append(make_row(algo, frames, *result[:3], result[3] if len(result) > 3 else None, seconds))
+    return rows
+
+
+def fused_rows(fused, results):
+    # Optimal rows from a bounded lookahead are upper bounds and say so
+    rows = []
+    for (algo, frames), result in results.items():
+        ghost_hits = result[3] if len(result) > 3 else None
+        rows.append(make_row(algo, frames, *result[:3], ghost_hits, fused.seconds[algo, frames]))
+        if fused.approximate((algo, frames)):
+            rows[-1]["approximate"] = True
+    return rows
+
+
+def page_chunks(args):
+    # One pass over the input as chunks of pages
+    if args.trace and args.addresses:
+        from address_trace import iter_address_pages
+        return (c.tolist() for c in iter_address_pages(args.trace, args.page_size, args.addresses, args.access_kinds))
+    if args.trace:
+        from trace_loader import iter_trace_chunks
+        return iter_trace_chunks(args.trace, fmt=args.format)
+    return [list(map(int, args.pages.split()))]
+
+
+def fused(algorithms, frame_counts, args):
+    # Every (algorithm, frames) pair from one read of the trace: each chunk is
+    # decoded once and fed to all the resumable stats-only engines
+    from page_replacement_engines import FusedSimulation
+
+    chunks, next_use, out_of_core = page_chunks(args), None, None
+    if "Optimal" in algorithms and args.fused_lookahead is None and args.trace:
+        # Exact Optimal reads next uses from a memory-mapped file instead of
+        # buffering the whole trace; the other engines read the mapped trace
+        from out_of_core_optimal import OutOfCoreTrace
+        chunk_size = 1 << 16  # Every engine gets each chunk as a list; small chunks keep that cheap
+        out_of_core = (OutOfCoreTrace.from_chunks(chunks, chunk_size) if args.addresses
+                       else OutOfCoreTrace(args.trace, args.format, chunk_size))
+        chunks, next_use = out_of_core.chunks(), out_of_core.next_use
+    try:
+        simulation = FusedSimulation(algorithms, frame_counts, lookahead=args.fused_lookahead, next_use=next_use)
+        for chunk in chunks:
+            simulation.feed(chunk)
+        return fused_rows(simulation, simulation.finish())
+    finally:
+        if out_of_core is not None:
+            out_of_core.close()
+
+
+def save_results(algorithms, frame_counts, args):
+    # Streams each run into <dir>/<algorithm>-<frames>.prr while it is simulated;
+    # returns the rows and the file paths
+    from result_file import record_run
+
+    os.makedirs(args.save_results, exist_ok=True)
+    out_of_core = None
+    if "Optimal" in algorithms and args.save_lookahead is None and args.trace:
+        # Exact Optimal reads next uses from a memory-mapped file instead of
+        # buffering the whole trace; built once for every frame count
+        from out_of_core_optimal import OutOfCoreTrace
+        out_of_core = (OutOfCoreTrace.from_chunks(page_chunks(args)) if args.addresses
+                       else OutOfCoreTrace(args.trace, args.format))
+    rows, paths = [], []
+    try:
+        for algo in algorithms:
+            for frames in frame_counts:
+                name = "".join(c if c.isalnum() else "_" for c in algo)
+                path = os.path.join(args.save_results, f"{name}-{frames}.prr")
+                start = time.perf_counter()
+                if algo == "Optimal" and out_of_core is not None:
+                    result = record_run(path, algo, frames, out_of_core.chunks(), dtype=args.result_dtype,
+                                        next_use=out_of_core.next_use)
+                else:
+                    lookahead = args.save_lookahead if algo == "Optimal" else None
+                    result = record_run(path, algo, frames, page_chunks(args), lookahead=lookahead,
+                                        dtype=args.result_dtype)
+                ghost_hits = result[3] if len(result) > 3 else None
+                rows.append(make_row(algo, frames, *result[:3], ghost_hits, time.perf_counter() - start))
+                if algo == "Optimal" and args.save_lookahead is not None:
+                    rows[-1]["approximate"] = True
+                paths.append(path)
+    finally:
+        if out_of_core is not None:
+            out_of_core.close()
+    return rows, paths
+
+
+def follow(algorithms, frame_counts, args):
+    # Live tailing: the engines are fed each block appended to the trace, and
+    # the table is reprinted after every block. Ends on Ctrl-C or after
+    # --idle-timeout seconds without growth; returns the final rows.
+    from page_replacement_engines import FusedSimulation
+    from trace_loader import follow_trace_chunks
+
+    simulation = FusedSimulation(algorithms, frame_counts, lookahead=args.lookahead)
+    chunks = follow_trace_chunks(args.trace, fmt=args.format, idle_timeout=args.idle_timeout)
+    try:
+        for chunk in chunks:
+            simulation.feed(chunk)
+            if not args.json:
+                print(format_table(fused_rows(simulation, simulation.snapshot())), end="\n\n", flush=True)
+    except KeyboardInterrupt:
+        # Interrupted while feeding: the reader still hands over the unread tail
+        try:
+            chunk = chunks.throw(KeyboardInterrupt)
+            while True:
+                simulation.feed(chunk)
+                chunk = next(chunks)
+        except StopIteration:
+            pass
+    return fused_rows(simulation, simulation.finish())
+
+
+def format_process_report(report, limit=20):
+    # Totals plus the processes with the most faults
+    lines = [f"{report['allocation']} / {report['algorithm']}: {report['faults']} faults in "
+             f"{report['references']} references, {len(report['processes'])} processes, {report['frames']} frames"]
+    lines.append(f"  {'PID':>8} {'Refs':>10} {'Faults':>10} {'Frames':>7} {'Evicted':>9}")
+    ranked = sorted(report["processes"].items(), key=lambda item: -item[1]["faults"])
+    for pid, p in ranked[:limit]:
+        lines.append(f"  {pid:>8} {p['references']:>10} {p['faults']:>10} {p['frames']:>7} {p['evicted']:>9}")
+    if len(ranked) > limit:
+        lines.append(f"  ... {len(ranked) - limit} more (use --json for all)")
+    return "\n".join(lines)
+
+
+def fault_curves(algorithms, max_frames, pages):
+    # FIFO / Clock faults for every frame count 1..max_frames in one pass each,
+    # with the frame counts where Belady's anomaly shows up
+    from multi_frame_sim import FAULT_CURVES, belady_anomalies
+
+    chosen = [algo for algo in algorithms if algo in FAULT_CURVES] or list(FAULT_CURVES)
+    trace = list(pages())
+    curves = []
+    for algo in chosen:
+        faults = FAULT_CURVES[algo](trace, max_frames)
+        curves.append({"algorithm": algo, "faults": faults, "anomalies": belady_anomalies(faults)})
+    return curves
+
+
+def format_fault_curves(curves):
+    lines = []
+    for curve in curves:
+        anomalies = set(curve["anomalies"])
+        lines.append(f"{curve['algorithm']}: " + (f"Belady's anomaly at {sorted(anomalies)} frames"
+                                                  if anomalies else "no Belady anomaly"))
+        lines.append(f"  {'Frames':>7} {'Faults':>10}")
+        for k, faults in enumerate(curve["faults"], start=1):
+            lines.append(f"  {k:>7} {faults:>10}" + ("  <- more faults than with one frame fewer" if k in anomalies else ""))
+    return "\n".join(lines)
+
+
+def format_table(rows):
+    lines = [f"{'Algorithm':<10} {'Frames':>7} {'Refs':>10} {'Faults':>10} {'Hit Ratio':>10} {'Time (s)':>9}  Ghost Hits"]
+    lines.append("-" * len(lines[0]))
+    for row in rows:
+        ghosts = ", ".join(f"{k}={v}" for k, v in row["ghost_hits"].items()) if row["ghost_hits"] else ""
+        name = row["algorithm"] + ("*" if row.get("approximate") else "")
+        lines.append(
+            f"{name:<10} {row['frames']:>7} {row['references']:>10} {row['misses']:>10} "
+            f"{row['hit_ratio']:>10.3f} {row['seconds']:>9.3f}  {ghosts}"
+        )
+    if any(row.get("approximate") for row in rows):
+        lines.append("* bounded lookahead: faults are an upper bound on the exact value")
+    return "\n".join(lines)
+
+
+def approximate_rows(args, pages):
+    # Sampled LRU miss-ratio estimate for every --frames value, from one pass
+    from shards_mrc import approximate_miss_ratio_curve
+    source = args.trace if args.trace and not args.addresses else pages()
+    estimate = approximate_miss_ratio_curve(source, max(args.frames), rate=args.sample_rate,
+                                            max_pages=args.sample_pages or None, fmt=args.format)
+    rows = []
+    for frames in args.frames:
+        rows.append({
+            "algorithm": "LRU (sampled)",
+            "frames": frames,
+            "references": estimate["references"],
+            "faults": estimate["faults"][frames - 1],
+            "faults_lower": estimate["lower"][frames - 1],
+            "faults_upper": estimate["upper"][frames - 1],
+            "miss_ratio": estimate["miss_ratio"][frames - 1],
+            "sample_rate": estimate["rate"],
+            "sampled_references": estimate["sampled_references"],
+            "bounded": estimate["bounded"],
+        })
+    return rows
+
+
+def format_approximate_table(rows):
+    lines = [f"{'Frames':>7} {'Refs':>12} {'Est. Faults':>12} {'95% Interval':>27} {'Miss Ratio':>10}"]
+    lines.append("-" * len(lines[0]))
+    for row in rows:
+        interval = f"[{row['faults_lower']}, {row['faults_upper']}]"
+        lines.append(f"{row['frames']:>7} {row['references']:>12} {row['faults']:>12} {interval:>27} {row['miss_ratio']:>10.3f}")
+    if rows:
+        lines.append(f"sample rate {rows[0]['sample_rate']:.4g}, {rows[0]['sampled_references']} sampled references")
+        if not rows[0]["bounded"]:
+            lines.append("too few pages sampled to estimate the error; raise --sample-rate")
+    return "\n".join(lines)
+
+
+def plot(rows, detail, pages, args):
+    from page_replacement_plots import (
+        ANIMATION_SLOT_LIMIT, animate_page_replacement, visualize_history_viewport, visualize_performance,
+    )
+
+    if detail is not None:
+        history, _, _, fault_positions = detail[:4]
+        # Too many frames to animate: the viewport viewer, as in the GUI
+        animate = args.animate and history.occupied <= ANIMATION_SLOT_LIMIT
+        viewer = animate_page_replacement if animate else visualize_history_viewport
+        viewer(rows[0]["algorithm"], history, None if args.trace else pages(), fault_positions)
+    for frames in args.frames:
+        chosen = [row for row in rows if row["frames"] == frames]
+        visualize_performance([row["algorithm"] for row in chosen],
+                              [row["misses"] for row in chosen], [row["hit_ratio"] for row in chosen])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the page replacement engines without the GUI.")
+    parser.add_argument("--algo", nargs="+", default=["all"], choices=ALGORITHMS + ["all"],
+                        help="algorithms to run (default: all)")
+    parser.add_argument("--frames", nargs="+", type=int, help="frame counts to simulate")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--trace", help="trace file: .i32/.i64/.bin binary, anything else whitespace-separated text")
+    source.add_argument("--pages", help='reference string, e.g. "7 0 1 2 0 3"')
+    parser.add_argument("--format", choices=["text", "binary"], help="override the trace format guessed from the extension")
+    parser.add_argument("--addresses", choices=["lackey", "hex"],
+                        help="--trace holds virtual addresses (Valgrind Lackey output or one hex address per line)")
+    parser.add_argument("--page-size", type=int, default=4096, help="bytes per page for --addresses (power of two)")
+    parser.add_argument("--access-kinds", default="ILSM",
+                        help='Lackey records to keep: I(nstruction), L(oad), S(tore), M(odify); e.g. "LSM" for data only')
+    parser.add_argument("--collapse-repeats", action="store_true",
+                        help="with --addresses, run the engines on runs of the same page and count the repeats as hits")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--workers", type=int, metavar="N",
+                        help="run the algorithm x frames grid in N worker processes (statistics only)")
+    parser.add_argument("--cache-dir", help="reuse and store results in this directory")
+    parser.add_argument("--profile", action="store_true",
+                        help="report wall/CPU time, refs/sec and engine counters per run")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="with --profile, also record the tracemalloc peak (from a second, untimed run of each engine)")
+    parser.add_argument("--approx-mrc", action="store_true",
+                        help="estimate LRU faults by hash-sampling pages (SHARDS) instead of simulating")
+    parser.add_argument("--sample-rate", type=float, default=0.01, help="starting sampling rate for --approx-mrc")
+    parser.add_argument("--sample-pages", type=int, default=8192,
+                        help="cap on sampled pages for --approx-mrc; lowers the rate as needed (0: no cap)")
+    parser.add_argument("--follow", action="store_true",
+                        help="keep reading --trace as it grows and update the results (Ctrl-C to stop)")
+    parser.add_argument("--lookahead", type=int, default=10_000,
+                        help="references Optimal may look ahead when following a trace (default: 10000)")
+    parser.add_argument("--idle-timeout", type=float, help="with --follow, stop after this many seconds without new data")
+    parser.add_argument("--processes", nargs="+", choices=["global", "equal", "proportional", "pff"],
+                        help='treat --trace as "pid page" / "timestamp pid page" lines and share --frames '
+                             "between the processes with these allocation policies")
+    parser.add_argument("--belady", action="store_true",
+                        help="FIFO/Clock faults for every frame count up to the largest --frames, flagging Belady's anomaly")
+    parser.add_argument("--out-of-core", action="store_true",
+                        help="run Optimal from a memory-mapped next-use file instead of holding the trace in memory")
+    parser.add_argument("--fused", action="store_true",
+                        help="run every algorithm and frame count in a single pass over the trace")
+    parser.add_argument("--fused-lookahead", type=int,
+                        help="with --fused, bound Optimal's lookahead (and memory); exact when omitted")
+    parser.add_argument("--save-results", metavar="DIR",
+                        help="stream every run (history included) into DIR/<algorithm>-<frames>.prr for later replay")
+    parser.add_argument("--result-dtype", choices=["int32", "int64"], default="int32",
+                        help="column type of --save-results files (int64 for page numbers beyond 2**31)")
+    parser.add_argument("--save-lookahead", type=int,
+                        help="with --save-results, bound Optimal's lookahead (and memory); "
+                             "exact when omitted, from a memory-mapped next-use file")
+    parser.add_argument("--replay", nargs="+", metavar="FILE",
+                        help="plot saved .prr results instead of simulating (no --frames or trace needed)")
+    parser.add_argument("--plot", action="store_true", help="show matplotlib charts of the results")
+    parser.add_argument("--animate", action="store_true",
+                        help="with --plot or --replay, play the run back step by step (space, arrows, drag to seek)")
+    parser.add_argument("--gui", action="store_true", help="open the Tk simulator instead")
+    args = parser.parse_args(argv)
+
+    if args.gui:
+        import runpy
+        runpy.run_module("OS_PAGE_REPLACEMENT_SIM", run_name="__main__")
+        return 0
+    try:
+        return execute(args, parser)
+    except (OSError, ValueError) as exc:  # Missing or unreadable traces, bad page numbers
+        parser.error(str(exc))
+
+
+def execute(args, parser):
+    # Everything after parsing; argument mistakes go to parser.error, and input
+    # errors are raised for main() to report the same way
+    if args.replay:
+        from page_replacement_plots import compare_result_files, replay_result_file
+        for path in args.replay:
+            replay_result_file(path, args.animate)
+        if len(args.replay) > 1:
+            compare_result_files(args.replay)
+        return 0
+
+    if not args.frames or any(f <= 0 for f in args.frames):
+        parser.error("--frames needs one or more positive integers")
+    if not args.trace and not args.pages:
+        parser.error("give a reference string with --pages or a trace file with --trace")
+
+    if args.addresses:
+        if not args.trace:
+            parser.error("--addresses needs a --trace file")
+        if args.follow or args.processes or args.out_of_core:
+            parser.error("--addresses cannot be combined with --follow, --processes or --out-of-core")
+        if args.collapse_repeats and (args.fused or args.save_results or args.approx_mrc or args.belady):
+            # Those modes read the expanded trace themselves
+            parser.error("--collapse-repeats cannot be combined with --fused, --save-results, --approx-mrc or --belady")
+        from address_trace import page_shift
+        page_shift(args.page_size)
+    elif args.collapse_repeats:
+        parser.error("--collapse-repeats needs --addresses")
+
+    algorithms = ALGORITHMS if "all" in args.algo else args.algo
+    pages = page_source(args)
+    if args.belady:
+        curves = fault_curves(algorithms if "all" not in args.algo else [], max(args.frames), pages)
+        if args.json:
+            json.dump(curves, sys.stdout, indent=2)
+            print()
+        else:
+            print(format_fault_curves(curves))
+        return 0
+
+    if args.processes:
+        if not args.trace:
+            parser.error("--processes needs a tagged --trace file")
+        from multiprocess_sim import simulate_processes
+        from trace_loader import read_tagged_trace
+        refs = read_tagged_trace(args.trace)
+        # ValueError: too few frames, or PFF with a policy that cannot resize
+        reports = [simulate_processes(refs, frames, algo, allocation)
+                   for algo in algorithms for frames in args.frames for allocation in args.processes]
+        if args.json:
+            json.dump(reports, sys.stdout, indent=2)
+            print()
+        else:
+            print("\n\n".join(format_process_report(report) for report in reports))
+        return 0
+
+    if args.fused:
+        rows = fused(algorithms, args.frames, args)
+        if args.json:
+            json.dump(rows, sys.stdout, indent=2)
+            print()
+        else:
+            print(format_table(rows))
+        return 0
+
+    if args.follow:
+        if not args.trace:
+            parser.error("--follow needs a --trace file")
+        rows = follow(algorithms, args.frames, args)
+        if args.json:
+            json.dump(rows, sys.stdout, indent=2)
+            print()
+        else:
+            print(format_table(rows))
+        return 0
+
+    if args.save_results:
+        rows, paths = save_results(algorithms, args.frames, args)  # ValueError: page numbers too large for int32
+        if args.json:
+            json.dump(rows, sys.stdout, indent=2)
+            print()
+        else:
+            print(format_table(rows))
+            print("\nSaved " + ", ".join(paths))
+        if args.plot:
+            from page_replacement_plots import compare_result_files, replay_result_file
+            for path in paths:
+                replay_result_file(path, args.animate)
+            if len(paths) > 1:
+                compare_result_files(paths)
+        return 0
+
+    if args.approx_mrc:
+        rows = approximate_rows(args, pages)
+        if args.json:
+            json.dump(rows, sys.stdout, indent=2)
+            print()
+        else:
+            print(format_approximate_table(rows))
+        return 0
+
+    if args.workers is not None:
+        if args.workers <= 0:
+            parser.error("--workers needs a positive integer")
+        if args.cache_dir or args.profile or args.profile_memory or args.out_of_core or args.collapse_repeats:
+            parser.error("--workers cannot be combined with --cache-dir, --profile, --out-of-core or --collapse-repeats")
+        rows = parallel_rows(algorithms, args.frames, pages, args)
+        if args.json:
+            json.dump(rows, sys.stdout, indent=2)
+            print()
+        else:
+            print(format_table(rows))
+        if args.plot:
+            plot(rows, None, pages, args)
+        return 0
+
+    # The frame-history viewer only makes sense for a single run
+    keep_history = algorithms[0] if args.plot and len(algorithms) == 1 and len(args.frames) == 1 else None
+    if args.collapse_repeats:
+        keep_history = None  # Histories of the collapsed trace would have the wrong step numbers
+    cache, digest = None, None
+    if args.cache_dir:
+        from result_cache import ResultCache, file_digest, trace_digest
+        cache = ResultCache(directory=args.cache_dir)
+        digest = f"{file_digest(args.trace)}{args.format or ''}" if args.trace else trace_digest(pages())
+        if args.addresses:
+            digest += f"{args.addresses}{args.page_size}{args.access_kinds}"
+    profiler = None
+    if args.profile or args.profile_memory:
+        from instrumentation import Profiler
+        profiler = Profiler(trace_memory=args.profile_memory)
+    stats_engines, out_of_core = STATS_ENGINES, None
+    if args.out_of_core and "Optimal" in algorithms:
+        if not args.trace:
+            parser.error("--out-of-core needs a --trace file")
+        from out_of_core_optimal import OutOfCoreTrace
+        out_of_core = OutOfCoreTrace(args.trace, args.format)
+        # Reads the trace and its next-use file itself; the streamed pages are ignored
+        stats_engines = dict(STATS_ENGINES, Optimal=lambda _, frames, monitor=None: out_of_core.optimal_stats(frames, monitor))
+    if args.collapse_repeats:
+        from address_trace import collapsed_page_stats, load_address_pages
+        runs, counts = load_address_pages(args.trace, args.page_size, args.addresses, args.access_kinds, collapse=True)
+        # The engines run on (runs, counts) directly; the full trace is never expanded
+        pages = lambda: runs
+        stats_engines = {algo: (lambda _, frames, monitor=None, algo=algo:
+                                collapsed_page_stats(algo, runs, counts, frames, monitor)) for algo in STATS_ENGINES}
+    try:
+        rows, detail = run(algorithms, args.frames, pages, keep_history, cache, digest, profiler, stats_engines)
+    finally:
+        if out_of_core is not None:
+            out_of_core.close()
+
+    if args.json:
+        json.dump(rows, sys.stdout, indent=2)
+        print()
+    else:
+        print(format_table(rows))
+        if profiler is not None:
+            print()
+            print(profiler.report())
+
+    if args.plot:
+        plot(rows, detail, pages, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
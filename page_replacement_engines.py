@@ -0,0 +1,1406 @@
+import heapq
+import threading
+import time
+from collections import OrderedDict, deque
+from array import array
+from itertools import islice
+from frame_history import FrameHistory
+from result_cache import trace_digest
+
+# Importable replacement engines with no GUI or plotting dependencies; the Tk
+# simulator, the CLI, the sweep and the benchmark all build on this module.
+
+# ------------------ Progress and Cancellation ------------------
+CHECK_INTERVAL = 4096  # Engines report progress / check for cancel this often
+
+
+class SimulationCancelled(Exception):
+    pass
+
+
+class ProgressMonitor:
+    # Shared between the GUI and a worker: the worker calls tick() from inside the
+    # engines, the GUI calls cancel() and drains `updates` from root.after
+    def __init__(self, total, updates=None):
+        self.total = total
+        self.updates = updates
+        self.stage = ""
+        self.offset = 0  # References completed by earlier stages
+        self.cancel_event = threading.Event()
+
+    def begin(self, stage, offset):
+        self.stage = stage
+        self.offset = offset
+
+    def tick(self, step):
+        if self.cancel_event.is_set():
+            raise SimulationCancelled()
+        if self.updates is not None:
+            self.updates.put(("progress", self.stage, self.offset + step, self.total))
+
+    def cancel(self):
+        self.cancel_event.set()
+
+
+# ------------------ Page Replacement Algorithms ------------------
+
+def as_page_buffer(pages):
+    # Engines that look ahead (Optimal, stack distances) need len() and indexing;
+    # lists, arrays and memmaps pass through, iterators are packed into an int64 array
+    if hasattr(pages, "__len__") and hasattr(pages, "__getitem__"):
+        return pages
+    return array('q', pages)
+
+
+def fifo_page_replacement(pages, frames, monitor=None):
+    frame_list = []
+    history = FrameHistory(frames)  # Delta-encoded frame states
+    fault_positions = []
+    hits, misses = 0, 0
+    fifo_index = 0  # Tracks which index to replace
+    resident = set()  # Pages currently in frame_list, for O(1) lookup
+
+    i = -1  # Last step processed; pages may be any iterable
+    for i, page in enumerate(pages):
+        if monitor is not None and i % CHECK_INTERVAL == 0:
+            monitor.tick(i)
+        if page in resident:
+            hits += 1
+        else:
+            misses += 1
+            if len(frame_list) < frames:
+                history.record(i, len(frame_list), page)
+                frame_list.append(page)
+            else:
+                replaced_index = fifo_index  # Get index of oldest page
+                resident.discard(frame_list[replaced_index])
+                frame_list[replaced_index] = page  # Replace at the same position
+                history.record(i, replaced_index, page)
+                fault_positions.append((i, page, replaced_index))  # Store step, new page, replaced index
+                fifo_index = (fifo_index + 1) % frames  # Move FIFO pointer
+            resident.add(page)
+
+    history.finish(i + 1)
+
+    return history, hits, misses, fault_positions
+
+
+def lru_page_replacement(pages, frames, monitor=None):
+    frame_list = []  # Stores pages in memory
+    history = FrameHistory(frames)  # Stores frame state changes
+    fault_positions = []  # Stores replaced page details
+    recency = OrderedDict()  # page -> slot, least recently used first
+
+    hits, misses = 0, 0
+
+    i = -1  # Last step processed; pages may be any iterable
+    for i, page in enumerate(pages):
+        if monitor is not None and i % CHECK_INTERVAL == 0:
+            monitor.tick(i)
+        if page in recency:
+            hits += 1
+            recency.move_to_end(page)  # Mark as most recently used
+        else:
+            misses += 1
+            if len(frame_list) < frames:
+                recency[page] = len(frame_list)
+                history.record(i, len(frame_list), page)
+                frame_list.append(page)  # Add page if space available
+            else:
+                # Least recently used page sits at the front of the ordering
+                lru_page, replaced_index = recency.popitem(last=False)
+                frame_list[replaced_index] = page  # Replace with new page
+                history.record(i, replaced_index, page)
+                fault_positions.append((i, page, replaced_index))  # Store fault info
+                recency[page] = replaced_index
+
+    history.finish(i + 1)
+
+    return history, hits, misses, fault_positions
+
+
+
+def next_use_indices(pages):
+    # One backward pass: next_use[i] is the index of the next reference to pages[i],
+    # or len(pages) if the page is never referenced again
+    n = len(pages)
+    next_use = array('q', [n]) * n
+    last_seen = {}
+    for i in range(n - 1, -1, -1):
+        page = pages[i]
+        next_use[i] = last_seen.get(page, n)
+        last_seen[page] = i
+    return next_use
+
+
+def optimal_page_replacement(pages, frames, monitor=None):
+    frame_list = []  # Stores current pages in memory
+    history = FrameHistory(frames)  # Stores frame state changes
+    fault_positions = []  # Stores (step, new page, replaced index)
+    hits, misses = 0, 0
+    slot_of = {}  # page -> index in frame_list
+    slot_next = []  # next use of the page held in each slot
+    heap = []  # max-heap of (-next use, slot); stale entries are skipped lazily
+
+    pages = as_page_buffer(pages)  # Look-ahead needs the whole trace
+    next_use = next_use_indices(pages)
+
+    for i, page in enumerate(pages):
+        if monitor is not None and i % CHECK_INTERVAL == 0:
+            monitor.tick(i)
+        slot = slot_of.get(page)
+        if slot is not None:
+            hits += 1  # Page hit
+        else:
+            misses += 1  # Page fault
+
+            if len(frame_list) < frames:
+                slot = len(frame_list)
+                frame_list.append(page)  # Fill empty frames first
+                slot_next.append(0)
+            else:
+                # Pop until we find an entry that still matches its slot; ties on
+                # "never used again" go to the lowest slot, as with max() over frame_list
+                while True:
+                    neg_next, slot = heapq.heappop(heap)
+                    if slot_next[slot] == -neg_next:
+                        break
+
+                # Replace the page used farthest in the future
+                del slot_of[frame_list[slot]]
+                frame_list[slot] = page
+                fault_positions.append((i, page, slot))  # Store replacement step
+
+            slot_of[page] = slot
+            history.record(i, slot, page)
+
+        slot_next[slot] = next_use[i]
+        heapq.heappush(heap, (-next_use[i], slot))
+
+        # Keep the heap proportional to the frame count rather than the trace
+        if len(heap) > 2 * frames + 16:
+            heap = [(-slot_next[s], s) for s in range(len(frame_list))]
+            heapq.heapify(heap)
+
+    history.finish(len(pages))
+
+    return history, hits, misses, fault_positions
+
+
+def lfu_page_replacement(pages, frames, monitor=None, aging_interval=None):
+    # O(1) LFU: buckets[f] holds the pages referenced f times in LRU order, so the
+    # victim is the oldest page of the lowest non-empty bucket. With aging_interval,
+    # all counts are halved every aging_interval references so stale hot pages fade.
+    frame_list = []
+    history = FrameHistory(frames)
+    fault_positions = []
+    hits, misses = 0, 0
+    slot_of = {}  # page -> index in frame_list
+    count = {}  # page -> reference count
+    buckets = {}  # count -> OrderedDict of pages, least recently used first
+    min_count = 0
+    last_used = {}  # Only kept when aging needs to re-merge buckets
+
+    i = -1  # Last step processed; pages may be any iterable
+    for i, page in enumerate(pages):
+        if monitor is not None and i % CHECK_INTERVAL == 0:
+            monitor.tick(i)
+        if aging_interval and i and i % aging_interval == 0:
+            min_count = age_lfu_counts(count, buckets, last_used)
+
+        if page in slot_of:
+            hits += 1
+            c = count[page]
+            del buckets[c][page]
+            if not buckets[c]:
+                del buckets[c]
+                if min_count == c:
+                    min_count = c + 1
+            count[page] = c + 1
+            buckets.setdefault(c + 1, OrderedDict())[page] = None
+        else:
+            misses += 1
+            if len(frame_list) < frames:
+                slot = len(frame_list)
+                frame_list.append(page)
+            else:
+                victim, _ = buckets[min_count].popitem(last=False)
+                if not buckets[min_count]:
+                    del buckets[min_count]
+                slot = slot_of.pop(victim)
+                del count[victim]
+                last_used.pop(victim, None)
+                frame_list[slot] = page
+                fault_positions.append((i, page, slot))
+            history.record(i, slot, page)
+            slot_of[page] = slot
+            count[page] = 1
+            buckets.setdefault(1, OrderedDict())[page] = None
+            min_count = 1
+
+        if aging_interval:
+            last_used[page] = i
+
+    history.finish(i + 1)
+
+    return history, hits, misses, fault_positions
+
+
+def age_lfu_counts(count, buckets, last_used):
+    # Halve every count and rebuild the buckets, keeping LRU order inside each one.
+    # O(frames log frames) once per aging interval.
+    buckets.clear()
+    for page in sorted(count, key=lambda p: last_used.get(p, -1)):
+        count[page] = max(1, count[page] // 2)
+        buckets.setdefault(count[page], OrderedDict())[page] = None
+    return min(buckets) if buckets else 0
+
+
+def clock_page_replacement(pages, frames, monitor=None):
+    # Second chance: each slot has a reference bit; the hand clears set bits as it
+    # sweeps and evicts the first slot whose bit is already clear
+    frame_list = []
+    history = FrameHistory(frames)
+    fault_positions = []
+    hits, misses = 0, 0
+    slot_of = {}  # page -> index in frame_list
+    ref_bits = bytearray(frames)
+    hand = 0
+
+    i = -1  # Last step processed; pages may be any iterable
+    for i, page in enumerate(pages):
+        if monitor is not None and i % CHECK_INTERVAL == 0:
+            monitor.tick(i)
+        slot = slot_of.get(page)
+        if slot is not None:
+            hits += 1
+            ref_bits[slot] = 1
+        else:
+            misses += 1
+            if len(frame_list) < frames:
+                slot = len(frame_list)
+                frame_list.append(page)
+            else:
+                while ref_bits[hand]:
+                    ref_bits[hand] = 0
+                    hand = (hand + 1) % frames
+                slot = hand
+                hand = (hand + 1) % frames
+                del slot_of[frame_list[slot]]
+                frame_list[slot] = page
+                fault_positions.append((i, page, slot))
+            history.record(i, slot, page)
+            slot_of[page] = slot
+            ref_bits[slot] = 1
+
+    history.finish(i + 1)
+
+    return history, hits, misses, fault_positions
+
+
+# ------------------ Scan-Resistant Policies (ARC / 2Q / LIRS) ------------------
+# Each policy keeps its lists as OrderedDicts (hash map + linked list), decides
+# hit/miss and victim in O(1) amortized, and counts hits in its ghost lists:
+# pages that were evicted but are still remembered. access(page) returns
+# (hit, victim), victim being None when a free frame is used. The engines return
+# the usual tuple plus a dict of ghost-list hits.
+
+class ArcPolicy:
+    # Adaptive Replacement Cache (Megiddo & Modha): T1/T2 hold pages seen once /
+    # at least twice, B1/B2 remember their evictions, and hits in B1 or B2 move
+    # the target size p of T1 up or down
+    def __init__(self, frames):
+        self.c = frames
+        self.p = 0.0
+        self.t1, self.t2 = OrderedDict(), OrderedDict()
+        self.b1, self.b2 = OrderedDict(), OrderedDict()
+        self.ghost_hits = {"B1": 0, "B2": 0}
+
+    def _replace(self, in_b2):
+        t1 = self.t1
+        if t1 and (not self.t2 or (in_b2 and len(t1) == self.p) or len(t1) > self.p):
+            page, _ = t1.popitem(last=False)
+            self.b1[page] = None
+        else:
+            page, _ = self.t2.popitem(last=False)
+            self.b2[page] = None
+        return page
+
+    def access(self, page):
+        t1, t2, b1, b2, c = self.t1, self.t2, self.b1, self.b2, self.c
+        if page in t1:
+            del t1[page]
+            t2[page] = None
+            return True, None
+        if page in t2:
+            t2.move_to_end(page)
+            return True, None
+
+        victim = None
+        full = len(t1) + len(t2) >= c
+        if page in b1:
+            self.ghost_hits["B1"] += 1
+            self.p = min(c, self.p + max(len(b2) / len(b1), 1))
+            if full:
+                victim = self._replace(False)
+            del b1[page]
+            t2[page] = None
+        elif page in b2:
+            self.ghost_hits["B2"] += 1
+            self.p = max(0, self.p - max(len(b1) / len(b2), 1))
+            if full:
+                victim = self._replace(True)
+            del b2[page]
+            t2[page] = None
+        else:
+            if len(t1) + len(b1) == c:
+                if len(t1) < c:
+                    b1.popitem(last=False)
+                    if full:
+                        victim = self._replace(False)
+                else:
+                    victim, _ = t1.popitem(last=False)  # T1 fills the cache: drop without a ghost
+            else:
+                total = len(t1) + len(t2) + len(b1) + len(b2)
+                if total >= c:
+                    if total == 2 * c:
+                        b2.popitem(last=False)
+                    if full:
+                        victim = self._replace(False)
+            t1[page] = None
+        return False, victim
+
+
+class TwoQueuePolicy:
+    # Full 2Q (Johnson & Shasha): new pages enter the FIFO A1in, pages evicted from
+    # it are remembered in A1out, and only a hit in A1out promotes a page to the
+    # LRU list Am, so a one-pass scan never displaces Am
+    def __init__(self, frames, kin=None, kout=None):
+        self.c = frames
+        self.kin = kin or max(1, frames // 4)
+        self.kout = kout or max(1, frames // 2)
+        self.am, self.a1in, self.a1out = OrderedDict(), OrderedDict(), OrderedDict()
+        self.ghost_hits = {"A1out": 0}
+
+    def _reclaim(self):
+        if len(self.am) + len(self.a1in) < self.c:
+            return None
+        if len(self.a1in) > self.kin or not self.am:
+            page, _ = self.a1in.popitem(last=False)
+            self.a1out[page] = None
+            if len(self.a1out) > self.kout:
+                self.a1out.popitem(last=False)
+        else:
+            page, _ = self.am.popitem(last=False)
+        return page
+
+    def access(self, page):
+        if page in self.am:
+            self.am.move_to_end(page)
+            return True, None
+        if page in self.a1in:
+            return True, None
+
+        if page in self.a1out:
+            self.ghost_hits["A1out"] += 1
+            del self.a1out[page]
+            victim = self._reclaim()
+            self.am[page] = None
+        else:
+            victim = self._reclaim()
+            self.a1in[page] = None
+        return False, victim
+
+
+class LirsPolicy:
+    # LIRS (Jiang & Zhang): pages with a short reuse distance are LIR and hold most
+    # frames; the rest (about hir_fraction) go to resident HIR pages in queue Q.
+    # Stack S orders pages by recency and keeps evicted HIR pages as ghosts; a miss
+    # on a ghost means a short reuse distance and promotes it to LIR.
+    # S is bounded: past ghost_factor * frames ghosts, the lowest one in S is
+    # dropped, so a long scan cannot grow S without limit. Pages in both Q and S
+    # sit in the same order in each, so ghosts are created in S order and the
+    # lowest is simply the oldest ghost.
+    def __init__(self, frames, hir_fraction=0.01, ghost_factor=2):
+        self.c = frames
+        hirs = max(1, int(frames * hir_fraction)) if frames > 1 else 0
+        self.lir_limit = frames - hirs
+        self.ghost_limit = max(1, ghost_factor * frames)
+        self.stack = OrderedDict()  # S, bottom first
+        self.queue = OrderedDict()  # Q: resident HIR pages, next victim first
+        self.ghosts = OrderedDict()  # Non-resident HIR pages in S, lowest first
+        self.lir = set()
+        self.ghost_hits = {"HIR": 0}
+
+    def _prune(self):
+        # The bottom of S must be LIR; HIR entries below the oldest LIR page are dropped
+        stack = self.stack
+        while stack:
+            page = next(iter(stack))
+            if page in self.lir:
+                break
+            del stack[page]
+            self.ghosts.pop(page, None)
+
+    def _demote(self):
+        page = next(iter(self.stack))  # Bottom of S, LIR after pruning
+        del self.stack[page]
+        self.lir.discard(page)
+        self.queue[page] = None
+        self._prune()
+
+    def _evict(self):
+        if len(self.lir) + len(self.queue) < self.c:
+            return None
+        if self.queue:
+            page, _ = self.queue.popitem(last=False)  # Stays in S as a ghost if it is there
+            if page in self.stack:
+                self.ghosts[page] = None
+                if len(self.ghosts) > self.ghost_limit:
+                    oldest, _ = self.ghosts.popitem(last=False)
+                    del self.stack[oldest]
+        else:
+            page = next(iter(self.stack))  # Only LIR pages resident: drop the oldest
+            del self.stack[page]
+            self.lir.discard(page)
+            self._prune()
+        return page
+
+    def access(self, page):
+        stack, queue, lir = self.stack, self.queue, self.lir
+        if page in lir:
+            stack.move_to_end(page)
+            self._prune()
+            return True, None
+        if page in queue:
+            if page in stack:
+                stack.move_to_end(page)
+                del queue[page]
+                lir.add(page)
+                if len(lir) > self.lir_limit:
+                    self._demote()
+            else:
+                stack[page] = None
+                queue.move_to_end(page)
+            return True, None
+
+        if page in stack:
+            self.ghost_hits["HIR"] += 1
+            del self.ghosts[page]  # So the eviction below cannot drop it
+        victim = self._evict()
+        if page in stack:
+            stack.move_to_end(page)
+            lir.add(page)
+            if len(lir) > self.lir_limit:
+                self._demote()
+        elif len(lir) < self.lir_limit:
+            stack[page] = None
+            lir.add(page)
+        else:
+            stack[page] = None
+            queue[page] = None
+        return False, victim
+
+
+def policy_page_replacement(policy, pages, frames, monitor=None):
+    frame_list = []
+    history = FrameHistory(frames)
+    fault_positions = []
+    hits, misses = 0, 0
+    slot_of = {}  # page -> index in frame_list
+
+    i = -1  # Last step processed; pages may be any iterable
+    for i, page in enumerate(pages):
+        if monitor is not None and i % CHECK_INTERVAL == 0:
+            monitor.tick(i)
+        hit, victim = policy.access(page)
+        if hit:
+            hits += 1
+        else:
+            misses += 1
+            if victim is None:
+                slot = len(frame_list)
+                frame_list.append(page)
+            else:
+                slot = slot_of.pop(victim)
+                frame_list[slot] = page
+                fault_positions.append((i, page, slot))
+            slot_of[page] = slot
+            history.record(i, slot, page)
+
+    history.finish(i + 1)
+
+    return history, hits, misses, fault_positions, dict(policy.ghost_hits)
+
+
+def policy_page_stats(policy, pages, monitor=None):
+    hits, misses, evictions = 0, 0, 0
+
+    for i, page in enumerate(pages):
+        if monitor is not None and i % CHECK_INTERVAL == 0:
+            monitor.tick(i)
+        hit, victim = policy.access(page)
+        if hit:
+            hits += 1
+        else:
+            misses += 1
+            if victim is not None:
+                evictions += 1
+
+    return hits, misses, evictions, dict(policy.ghost_hits)
+
+
+def arc_page_replacement(pages, frames, monitor=None):
+    return policy_page_replacement(ArcPolicy(frames), pages, frames, monitor)
+
+
+def two_queue_page_replacement(pages, frames, monitor=None):
+    return policy_page_replacement(TwoQueuePolicy(frames), pages, frames, monitor)
+
+
+def lirs_page_replacement(pages, frames, monitor=None):
+    return policy_page_replacement(LirsPolicy(frames), pages, frames, monitor)
+
+
+def arc_page_stats(pages, frames, monitor=None):
+    return policy_page_stats(ArcPolicy(frames), pages, monitor)
+
+
+def two_queue_page_stats(pages, frames, monitor=None):
+    return policy_page_stats(TwoQueuePolicy(frames), pages, monitor)
+
+
+def lirs_page_stats(pages, frames, monitor=None):
+    return policy_page_stats(LirsPolicy(frames), pages, monitor)
+
+
+# ------------------ Statistics-Only Engines ------------------
+# Same replacement decisions as above, but no history, fault positions or
+# per-step allocations. Each returns (hits, misses, evictions). FIFO, LRU and
+# Clock run the counting loops of their resumable policies (below), so those
+# loops exist once.
+
+def fifo_page_stats(pages, frames, monitor=None):
+    return ResumableEngine(FifoPolicy(frames), frames, keep_history=False).feed(pages, monitor).snapshot()
+
+
+def lru_page_stats(pages, frames, monitor=None):
+    return ResumableEngine(LruPolicy(frames), frames, keep_history=False).feed(pages, monitor).snapshot()
+
+
+class NextUseOptimal:
+    # Stats-only Optimal over (page, index of its next reference) pairs, resumable
+    # across feed() calls. optimal_page_stats feeds it the whole trace with
+    # next_use_indices; the out-of-core and fused drivers feed it chunk by chunk
+    # from a memory-mapped next-use file, so it never needs the trace in memory.
+    def __init__(self, frames):
+        self.frames = frames
+        self.upcoming = {}  # Resident page -> index of its next reference
+        self.heap = []  # (-next use, page); stale entries are skipped lazily
+        self.hits, self.misses, self.evictions = 0, 0, 0
+        self.step = 0  # Pairs fed so far
+
+    def feed(self, pairs, monitor=None):
+        upcoming, heap, frames = self.upcoming, self.heap, self.frames
+        hits, misses, evictions, i = self.hits, self.misses, self.evictions, self.step
+        try:
+            for page, next_use in pairs:
+                if monitor is not None and i % CHECK_INTERVAL == 0:
+                    monitor.tick(i)
+                if page in upcoming:
+                    hits += 1
+                else:
+                    misses += 1
+                    if len(upcoming) >= frames:
+                        while True:
+                            neg_next, victim = heapq.heappop(heap)
+                            if upcoming.get(victim) == -neg_next:
+                                break
+                        del upcoming[victim]
+                        evictions += 1
+
+                upcoming[page] = next_use
+                heapq.heappush(heap, (-next_use, page))
+                if len(heap) > 2 * frames + 16:
+                    heap = [(-nxt, p) for p, nxt in upcoming.items()]
+                    heapq.heapify(heap)
+                i += 1
+        finally:
+            # The heap may have been rebuilt; keep everything in step even if a monitor cancels
+            self.heap = heap
+            self.hits, self.misses, self.evictions, self.step = hits, misses, evictions, i
+        return self
+
+    def stats(self):
+        return self.hits, self.misses, self.evictions
+
+
+def optimal_page_stats(pages, frames, monitor=None):
+    pages = as_page_buffer(pages)
+    return NextUseOptimal(frames).feed(zip(pages, next_use_indices(pages)), monitor).stats()
+
+
+def lfu_page_stats(pages, frames, monitor=None, aging_interval=None):
+    count = {}
+    buckets = {}
+    min_count = 0
+    last_used = {}
+    hits, misses, evictions = 0, 0, 0
+
+    for i, page in enumerate(pages):
+        if monitor is not None and i % CHECK_INTERVAL == 0:
+            monitor.tick(i)
+        if aging_interval and i and i % aging_interval == 0:
+            min_count = age_lfu_counts(count, buckets, last_used)
+
+        c = count.get(page)
+        if c is not None:
+            hits += 1
+            del buckets[c][page]
+            if not buckets[c]:
+                del buckets[c]
+                if min_count == c:
+                    min_count = c + 1
+            count[page] = c + 1
+            buckets.setdefault(c + 1, OrderedDict())[page] = None
+        else:
+            misses += 1
+            if len(count) >= frames:
+                victim, _ = buckets[min_count].popitem(last=False)
+                if not buckets[min_count]:
+                    del buckets[min_count]
+                del count[victim]
+                last_used.pop(victim, None)
+                evictions += 1
+            count[page] = 1
+            buckets.setdefault(1, OrderedDict())[page] = None
+            min_count = 1
+
+        if aging_interval:
+            last_used[page] = i
+
+    return hits, misses, evictions
+
+
+def clock_page_stats(pages, frames, monitor=None):
+    return ResumableEngine(ClockPolicy(frames), frames, keep_history=False).feed(pages, monitor).snapshot()
+
+
+# ------------------ Engine Registry ------------------
+# Name -> engine, in the order the GUI offers and compares them. Full engines
+# return (history, hits, misses, fault_positions[, ghost_hits]) and stats engines
+# (hits, misses, evictions[, ghost_hits]).
+
+REPLACEMENT_ENGINES = {
+    "FIFO": fifo_page_replacement,
+    "LRU": lru_page_replacement,
+    "Optimal": optimal_page_replacement,
+    "LFU": lfu_page_replacement,
+    "Clock": clock_page_replacement,
+    "ARC": arc_page_replacement,
+    "2Q": two_queue_page_replacement,
+    "LIRS": lirs_page_replacement,
+}
+
+STATS_ENGINES = {
+    "FIFO": fifo_page_stats,
+    "LRU": lru_page_stats,
+    "Optimal": optimal_page_stats,
+    "LFU": lfu_page_stats,
+    "Clock": clock_page_stats,
+    "ARC": arc_page_stats,
+    "2Q": two_queue_page_stats,
+    "LIRS": lirs_page_stats,
+}
+
+ALGORITHMS = list(REPLACEMENT_ENGINES)
+
+
+# ------------------ Resumable Engines ------------------
+# Engines that keep their frame state between calls: feed(pages) processes only
+# the new references and snapshot() returns the usual result tuple for all of
+# them so far. The history and fault list in a snapshot are the engine's own,
+# append-only objects and keep growing with later feeds. FIFO, LRU, LFU and
+# Clock are written as policies with the access(page) -> (hit, victim) protocol
+# of ARC / 2Q / LIRS above, so ResumableEngine drives all seven.
+
+class FifoPolicy:
+    def __init__(self, frames):
+        self.c = frames
+        self.queue = OrderedDict()  # Resident pages, oldest first
+
+    def access(self, page):
+        if page in self.queue:
+            return True, None
+        victim = None
+        if len(self.queue) >= self.c:
+            victim, _ = self.queue.popitem(last=False)
+        self.queue[page] = None
+        return False, victim
+
+    def resize(self, frames):
+        # Change the frame budget; returns the pages evicted to fit it
+        self.c = frames
+        return [self.queue.popitem(last=False)[0] for _ in range(len(self.queue) - frames)]
+
+    def feed_counts(self, pages):
+        # access() over pages with the loop inlined; returns (hits, misses, evictions)
+        queue, c = self.queue, self.c
+        hits, misses, evictions = 0, 0, 0
+        for page in pages:
+            if page in queue:
+                hits += 1
+            else:
+                misses += 1
+                if len(queue) >= c:
+                    queue.popitem(last=False)
+                    evictions += 1
+                queue[page] = None
+        return hits, misses, evictions
+
+
+class LruPolicy:
+    def __init__(self, frames):
+        self.c = frames
+        self.recency = OrderedDict()  # Resident pages, least recently used first
+
+    def access(self, page):
+        recency = self.recency
+        if page in recency:
+            recency.move_to_end(page)
+            return True, None
+        victim = None
+        if len(recency) >= self.c:
+            victim, _ = recency.popitem(last=False)
+        recency[page] = None
+        return False, victim
+
+    def resize(self, frames):
+        self.c = frames
+        return [self.recency.popitem(last=False)[0] for _ in range(len(self.recency) - frames)]
+
+    def feed_counts(self, pages):
+        recency, c = self.recency, self.c
+        hits, misses, evictions = 0, 0, 0
+        for page in pages:
+            if page in recency:
+                hits += 1
+                recency.move_to_end(page)
+            else:
+                misses += 1
+                if len(recency) >= c:
+                    recency.popitem(last=False)
+                    evictions += 1
+                recency[page] = None
+        return hits, misses, evictions
+
+
+class LfuPolicy:
+    # Same buckets and aging as lfu_page_replacement
+    def __init__(self, frames, aging_interval=None):
+        self.c = frames
+        self.aging_interval = aging_interval
+        self.count = {}
+        self.buckets = {}
+        self.min_count = 0
+        self.last_used = {}
+        self.step = 0
+
+    def access(self, page):
+        count, buckets = self.count, self.buckets
+        i = self.step
+        self.step += 1
+        if self.aging_interval:
+            if i and i % self.aging_interval == 0:
+                self.min_count = age_lfu_counts(count, buckets, self.last_used)
+            self.last_used[page] = i
+
+        c = count.get(page)
+        if c is not None:
+            del buckets[c][page]
+            if not buckets[c]:
+                del buckets[c]
+                if self.min_count == c:
+                    self.min_count = c + 1
+            count[page] = c + 1
+            buckets.setdefault(c + 1, OrderedDict())[page] = None
+            return True, None
+
+        victim = None
+        if len(count) >= self.c:
+            victim, _ = buckets[self.min_count].popitem(last=False)
+            if not buckets[self.min_count]:
+                del buckets[self.min_count]
+            del count[victim]
+            self.last_used.pop(victim, None)
+        count[page] = 1
+        buckets.setdefault(1, OrderedDict())[page] = None
+        self.min_count = 1
+        return False, victim
+
+    def resize(self, frames):
+        self.c = frames
+        evicted = []
+        while len(self.count) > frames:
+            bucket = self.buckets[self.min_count]
+            victim, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self.buckets[self.min_count]
+                self.min_count = min(self.buckets, default=0)
+            del self.count[victim]
+            self.last_used.pop(victim, None)
+            evicted.append(victim)
+        return evicted
+
+
+class ClockPolicy:
+    def __init__(self, frames):
+        self.c = frames
+        self.frame_list = []
+        self.slot_of = {}
+        self.ref_bits = bytearray(frames)
+        self.hand = 0
+
+    def access(self, page):
+        slot = self.slot_of.get(page)
+        if slot is not None:
+            self.ref_bits[slot] = 1
+            return True, None
+
+        victim = None
+        if len(self.frame_list) < self.c:
+            slot = len(self.frame_list)
+            self.frame_list.append(page)
+        else:
+            ref_bits, hand = self.ref_bits, self.hand
+            while ref_bits[hand]:
+                ref_bits[hand] = 0
+                hand = (hand + 1) % self.c
+            slot = hand
+            self.hand = (hand + 1) % self.c
+            victim = self.frame_list[slot]
+            del self.slot_of[victim]
+            self.frame_list[slot] = page
+        self.slot_of[page] = slot
+        self.ref_bits[slot] = 1
+        return False, victim
+
+    def feed_counts(self, pages):
+        frame_list, slot_of, ref_bits, hand, c = self.frame_list, self.slot_of, self.ref_bits, self.hand, self.c
+        hits, misses, evictions = 0, 0, 0
+        for page in pages:
+            slot = slot_of.get(page)
+            if slot is not None:
+                hits += 1
+                ref_bits[slot] = 1
+            else:
+                misses += 1
+                if len(frame_list) < c:
+                    slot = len(frame_list)
+                    frame_list.append(page)
+                else:
+                    while ref_bits[hand]:
+                        ref_bits[hand] = 0
+                        hand = (hand + 1) % c
+                    slot = hand
+                    hand = (hand + 1) % c
+                    del slot_of[frame_list[slot]]
+                    frame_list[slot] = page
+                    evictions += 1
+                slot_of[page] = slot
+                ref_bits[slot] = 1
+        self.hand = hand
+        return hits, misses, evictions
+
+
+class ResumableEngine:
+    def __init__(self, policy, frames, keep_history=True):
+        self.policy = policy
+        self.frames = frames
+        self.history = FrameHistory(frames) if keep_history else None
+        self.fault_positions = [] if keep_history else None
+        self.slot_of = {}  # page -> slot, only tracked with a history
+        self.hits, self.misses, self.evictions = 0, 0, 0
+        self.step = 0  # References processed so far
+
+    def feed(self, pages, monitor=None):
+        if self.history is None and hasattr(self.policy, "feed_counts"):
+            if monitor is None:
+                self._count(pages)
+                return self
+            # The monitor is consulted between batches of CHECK_INTERVAL references
+            pages = iter(pages)
+            while True:
+                batch = list(islice(pages, CHECK_INTERVAL))
+                if not batch:
+                    return self
+                monitor.tick(self.step)
+                self._count(batch)
+        access, history, slot_of = self.policy.access, self.history, self.slot_of
+        hits, misses, evictions, step = self.hits, self.misses, self.evictions, self.step
+        try:
+            for page in pages:
+                if monitor is not None and step % CHECK_INTERVAL == 0:
+                    monitor.tick(step)
+                hit, victim = access(page)
+                if hit:
+                    hits += 1
+                else:
+                    misses += 1
+                    if victim is not None:
+                        evictions += 1
+                    if history is not None:
+                        if victim is None:
+                            slot = len(slot_of)
+                        else:
+                            slot = slot_of.pop(victim)
+                            self.fault_positions.append((step, page, slot))
+                        slot_of[page] = slot
+                        history.record(step, slot, page)
+                step += 1
+        finally:
+            # Keep the counters in step with the policy even if a monitor cancels
+            self.hits, self.misses, self.evictions, self.step = hits, misses, evictions, step
+        return self
+
+    def _count(self, pages):
+        hits, misses, evictions = self.policy.feed_counts(pages)
+        self.hits, self.misses, self.evictions = self.hits + hits, self.misses + misses, self.evictions + evictions
+        self.step += hits + misses
+
+    def finish(self, monitor=None):
+        # End of input; nothing is held back here (see WindowedOptimalEngine)
+        return self.snapshot()
+
+    def drop_history(self):
+        # Keep counting stats-only from here on and free the history
+        self.history = self.fault_positions = None
+        self.slot_of = {}
+
+    def snapshot(self):
+        if self.history is None:
+            result = (self.hits, self.misses, self.evictions)
+        else:
+            self.history.finish(self.step)
+            result = (self.history, self.hits, self.misses, self.fault_positions)
+        ghost_hits = getattr(self.policy, "ghost_hits", None)
+        if ghost_hits is not None:
+            result += (dict(ghost_hits),)
+        return result
+
+
+class WindowedOptimalEngine(ResumableEngine):
+    # Optimal with bounded lookahead: reference i is decided once references up
+    # to i + lookahead have been fed, so feed() lags the input by `lookahead`
+    # references and finish() decides the rest. A resident page not referenced
+    # again inside the window counts as "beyond the window" (ties go to the
+    # lowest slot, like "never used again" in optimal_page_replacement), so with
+    # a finite lookahead the result is an upper bound on Optimal's faults. With
+    # lookahead=None nothing is decided before finish() and the result equals
+    # optimal_page_replacement exactly.
+    BEYOND = 1 << 62
+
+    def __init__(self, frames, lookahead=None, keep_history=True):
+        super().__init__(None, frames, keep_history)
+        self.lookahead = lookahead
+        self.received = 0  # References fed; self.step counts those decided
+        self.pending = deque()  # Pages fed but not decided yet
+        self.pending_next = {}  # Pending position -> position of the next reference
+        self.last_pos = {}  # page -> latest fed position
+        self.frame_list = []
+        self.slot_next = []  # Next known use of the page in each slot
+        self.heap = []  # max-heap of (-next use, slot); stale entries are skipped lazily
+
+    def feed(self, pages, monitor=None):
+        last_pos, pending_next, slot_next = self.last_pos, self.pending_next, self.slot_next
+        for page in pages:
+            j = self.received
+            self.received += 1
+            k = last_pos.get(page)
+            if k is not None:
+                if k >= self.step:
+                    pending_next[k] = j
+                else:
+                    slot = self.slot_of.get(page)
+                    if slot is not None and slot_next[slot] == self.BEYOND:
+                        # A resident page's next use just came into view
+                        slot_next[slot] = j
+                        heapq.heappush(self.heap, (-j, slot))
+            last_pos[page] = j
+            self.pending.append(page)
+            if self.lookahead is not None and self.received - self.step > self.lookahead:
+                self._decide(monitor)
+        return self
+
+    def finish(self, monitor=None):
+        while self.pending:
+            self._decide(monitor)
+        return self.snapshot()
+
+    def _decide(self, monitor):
+        page = self.pending.popleft()
+        self._place(page, self.pending_next.pop(self.step, self.BEYOND), monitor)
+
+        # Positions of pages that are neither pending nor resident are never read again
+        if len(self.last_pos) > 2 * (self.frames + len(self.pending)) + 1024:
+            self.last_pos = {p: k for p, k in self.last_pos.items() if k >= self.step or p in self.slot_of}
+
+    def _place(self, page, next_use, monitor):
+        # Reference self.step, whose next use is known
+        i = self.step
+        if monitor is not None and i % CHECK_INTERVAL == 0:
+            monitor.tick(i)
+        frame_list, slot_next, slot_of = self.frame_list, self.slot_next, self.slot_of
+
+        slot = slot_of.get(page)
+        if slot is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            if len(frame_list) < self.frames:
+                slot = len(frame_list)
+                frame_list.append(page)
+                slot_next.append(0)
+            else:
+                while True:
+                    neg_next, slot = heapq.heappop(self.heap)
+                    if slot_next[slot] == -neg_next:
+                        break
+                del slot_of[frame_list[slot]]
+                frame_list[slot] = page
+                self.evictions += 1
+                if self.fault_positions is not None:
+                    self.fault_positions.append((i, page, slot))
+            slot_of[page] = slot
+            if self.history is not None:
+                self.history.record(i, slot, page)
+
+        slot_next[slot] = next_use
+        heapq.heappush(self.heap, (-next_use, slot))
+        if len(self.heap) > 2 * self.frames + 16:
+            self.heap = [(-slot_next[s], s) for s in range(len(frame_list))]
+            heapq.heapify(self.heap)
+        self.step = i + 1
+
+
+class NextUseOptimalEngine:
+    # Exact stats-only Optimal for chunked feeds: the next use of every fed
+    # position is read from next_use (e.g. OutOfCoreTrace.next_use, a memory-
+    # mapped file), so nothing but the resident pages is held in memory.
+    def __init__(self, frames, next_use):
+        self.optimal = NextUseOptimal(frames)
+        self.next_use = next_use
+
+    def feed(self, pages, monitor=None):
+        start = self.optimal.step
+        next_uses = self.next_use[start:start + len(pages)]
+        if hasattr(next_uses, "tolist"):
+            next_uses = next_uses.tolist()
+        self.optimal.feed(zip(pages, next_uses), monitor)
+        return self
+
+    def finish(self, monitor=None):
+        return self.snapshot()
+
+    def snapshot(self):
+        return self.optimal.stats()
+
+
+class NextUseHistoryOptimalEngine(WindowedOptimalEngine):
+    # Exact Optimal with a history for chunked feeds: next uses come from
+    # next_use as in NextUseOptimalEngine, and every reference is placed as soon
+    # as it is fed, so no part of the trace is held back
+    def __init__(self, frames, next_use, keep_history=True):
+        super().__init__(frames, None, keep_history)
+        self.next_use = next_use
+
+    def feed(self, pages, monitor=None):
+        next_uses = self.next_use[self.step:self.step + len(pages)]
+        if hasattr(next_uses, "tolist"):
+            next_uses = next_uses.tolist()
+        for page, next_use in zip(pages, next_uses):
+            self._place(page, next_use, monitor)
+        self.received = self.step
+        return self
+
+
+RESUMABLE_POLICIES = {
+    "FIFO": FifoPolicy,
+    "LRU": LruPolicy,
+    "LFU": LfuPolicy,
+    "Clock": ClockPolicy,
+    "ARC": ArcPolicy,
+    "2Q": TwoQueuePolicy,
+    "LIRS": LirsPolicy,
+}
+
+
+def resumable_engine(algorithm, frames, keep_history=True, lookahead=None, next_use=None):
+    # next_use (next reference index of every position that will be fed) makes
+    # Optimal exact without buffering the trace
+    if algorithm == "Optimal":
+        if next_use is not None:
+            if keep_history:
+                return NextUseHistoryOptimalEngine(frames, next_use)
+            return NextUseOptimalEngine(frames, next_use)
+        return WindowedOptimalEngine(frames, lookahead, keep_history)
+    return ResumableEngine(RESUMABLE_POLICIES[algorithm](frames), frames, keep_history)
+
+
+# ------------------ Miss-Ratio Curves (Stack Distance) ------------------
+
+def lru_stack_distances(pages):
+    # distances[i] is the LRU stack depth of pages[i] (1 = most recently used),
+    # or 0 for a first reference. A Fenwick tree holds a 1 at the last-use time
+    # of every page, so the depth is the number of marks since the previous use.
+    pages = as_page_buffer(pages)
+    n = len(pages)
+    tree = [0] * (n + 1)
+    last_use = {}
+    distances = [0] * n
+
+    def add(pos, delta):
+        pos += 1
+        while pos <= n:
+            tree[pos] += delta
+            pos += pos & -pos
+
+    def prefix(pos):  # Sum of marks in [0, pos)
+        total = 0
+        while pos > 0:
+            total += tree[pos]
+            pos -= pos & -pos
+        return total
+
+    for i, page in enumerate(pages):
+        prev = last_use.get(page)
+        if prev is not None:
+            distances[i] = prefix(i) - prefix(prev)
+            add(prev, -1)
+        add(i, 1)
+        last_use[page] = i
+
+    return distances
+
+
+def optimal_stack_distances(pages, max_frames):
+    # Mattson's OPT stack: after each reference the page moves to the top and the
+    # pages above its old position are pushed down, the one needed later sinking.
+    # Only the top max_frames entries are kept; 0 means a miss at every size.
+    next_use = next_use_indices(pages)
+    stack = []
+    upcoming = {}  # page -> index of its next reference
+    distances = [0] * len(pages)
+
+    for i, page in enumerate(pages):
+        try:
+            depth = stack.index(page)
+        except ValueError:
+            depth = len(stack)
+
+        if stack:
+            carry = stack[0]
+            stack[0] = page
+            for j in range(1, depth):
+                if upcoming[stack[j]] > upcoming[carry]:
+                    stack[j], carry = carry, stack[j]
+            if depth < len(stack):
+                stack[depth] = carry
+                distances[i] = depth + 1
+            elif len(stack) < max_frames:
+                stack.append(carry)
+        else:
+            stack.append(page)
+
+        upcoming[page] = next_use[i]
+
+    return distances
+
+
+def miss_ratio_curve(pages, max_frames=None, algorithm="LRU"):
+    # Faults for every frame count 1..max_frames from a single pass;
+    # curve[k - 1] equals the misses of the matching replacement function with k frames
+    pages = as_page_buffer(pages)
+    if max_frames is None:
+        max_frames = len(set(pages))
+    if max_frames <= 0:
+        return []
+
+    if algorithm == "LRU":
+        distances = lru_stack_distances(pages)
+    elif algorithm == "Optimal":
+        distances = optimal_stack_distances(pages, max_frames)
+    else:
+        raise ValueError(f"No stack-distance mode for {algorithm}")
+
+    # counts[d] = references found at depth d; depth 0 (or beyond max_frames) always misses
+    counts = [0] * (max_frames + 1)
+    for d in distances:
+        counts[d if d <= max_frames else 0] += 1
+
+    curve = [0] * max_frames
+    deeper = 0  # References deeper than the current frame count
+    for k in range(max_frames, 0, -1):
+        curve[k - 1] = counts[0] + deeper
+        deeper += counts[k]
+
+    return curve
+
+
+# ------------------ Algorithm Comparison ------------------
+
+def simulate(page_refs, num_frames, selected_algo, monitor=None, cache=None, profiler=None):
+    # profiler: optional instrumentation.Profiler; profiled runs always execute
+    # the engine (a cached result has nothing to measure) but still fill the cache
+    algorithms = ALGORITHMS
+    results = {}
+    selected = None
+    digest = trace_digest(page_refs) if cache is not None else None
+
+    def run(algo, mode):
+        engine = REPLACEMENT_ENGINES[algo] if mode == "full" else STATS_ENGINES[algo]
+        if profiler is not None:
+            result = profiler.run(engine, page_refs, num_frames, algo, mode, monitor)
+            if cache is not None:
+                cache.put(digest, num_frames, algo, mode, result)
+            return result
+        if cache is None:
+            return engine(page_refs, num_frames, monitor)
+        return cache.fetch(digest, num_frames, algo, mode, lambda: engine(page_refs, num_frames, monitor))
+
+    for n, algo in enumerate(algorithms):
+        if monitor is not None:
+            monitor.begin(algo, n * len(page_refs))
+
+        # Only the selected algorithm needs its history; the rest are counted
+        if algo == selected_algo:
+            selected = run(algo, "full")
+            hits, misses = selected[1:3]
+        else:
+            hits, misses = run(algo, "stats")[:2]
+        results[algo] = (misses, hits / (hits + misses))
+
+    return algorithms, results, selected
+
+
+class FusedSimulation:
+    # Every (algorithm, frames) pair as a resumable engine, all fed from a single
+    # decode of each chunk, so comparing policies costs one pass over the trace.
+    # Optimal is exact and holds only its frames when given next_use (see
+    # NextUseOptimalEngine). Otherwise it is WindowedOptimalEngine: exact with
+    # lookahead=None, but then every reference is buffered until finish(), so
+    # long traces should pass next_use or a finite lookahead (an upper bound).
+    def __init__(self, algorithms=None, frame_counts=(), keep_history=False, lookahead=None, next_use=None):
+        self.engines = {(algo, frames): resumable_engine(algo, frames, keep_history, lookahead, next_use)
+                        for algo in algorithms or ALGORITHMS for frames in frame_counts}
+        self.seconds = dict.fromkeys(self.engines, 0.0)  # Time spent in each engine
+        self.position = 0  # References fed so far
+
+    def feed(self, pages, monitor=None):
+        if monitor is not None:
+            monitor.tick(self.position)
+        # NumPy chunks become Python ints once, not once per engine
+        pages = pages.tolist() if hasattr(pages, "tolist") else list(pages)
+        for key, engine in self.engines.items():
+            start = time.perf_counter()
+            engine.feed(pages)
+            self.seconds[key] += time.perf_counter() - start
+        self.position += len(pages)
+        return self
+
+    def snapshot(self):
+        return {key: engine.snapshot() for key, engine in self.engines.items()}
+
+    def finish(self):
+        return {key: engine.finish() for key, engine in self.engines.items()}
+
+    def approximate(self, key):
+        # True when the engine's faults are only an upper bound (bounded lookahead)
+        return getattr(self.engines[key], "lookahead", None) is not None
+
+
+def fused_simulation(chunks, frame_counts, algorithms=None, keep_history=False, lookahead=None, monitor=None,
+                     next_use=None):
+    # {(algorithm, frames): result} from one pass over an iterable of page chunks
+    fused = FusedSimulation(algorithms, frame_counts, keep_history, lookahead, next_use)
+    for chunk in chunks:
+        fused.feed(chunk, monitor)
+    return fused.finish()
+
+
+class IncrementalSimulation:
+    # simulate() for a reference string that grows between runs. When the new
+    # string extends the previous one at the same frame count, the resumable
+    # engines are fed only the appended references; anything else starts over.
+    # As in simulate(), only the selected algorithm keeps a history: the others
+    # run stats-only. A newly selected algorithm's full result comes from the
+    # cache, or its engine is rebuilt with a history from the whole string; the
+    # history of the previous selection goes into the cache when it is dropped,
+    # so switching back is a lookup. Optimal depends on the future, so it is
+    # always rerun on the whole string.
+    def __init__(self):
+        self.reset()
+
+    def reset(self, cache=None):
+        if cache is not None:
+            for algo, engine in self.engines.items():
+                if engine.history is not None:
+                    self._release(algo, cache)
+        self.page_refs = []
+        self.num_frames = None
+        self.engines = {}
+
+    def _release(self, algo, cache):
+        # The engine's history is final for the string it was fed: cache it, count on stats-only
+        engine = self.engines[algo]
+        if cache is not None:
+            cache.put(trace_digest(self.page_refs), self.num_frames, algo, "full", engine.snapshot())
+        engine.drop_history()
+
+    def run(self, page_refs, num_frames, selected_algo, monitor=None, cache=None):
+        if num_frames != self.num_frames or page_refs[:len(self.page_refs)] != self.page_refs:
+            self.reset(cache)
+            self.num_frames = num_frames
+        appended = page_refs[len(self.page_refs):]
+        digest = trace_digest(page_refs) if cache is not None else None
+        results = {}
+        selected = None
+
+        try:
+            for n, algo in enumerate(ALGORITHMS):
+                if monitor is not None:
+                    monitor.begin(algo, n * len(page_refs))
+                mode = "full" if algo == selected_algo else "stats"
+                if algo == "Optimal":
+                    engine = REPLACEMENT_ENGINES[algo] if mode == "full" else STATS_ENGINES[algo]
+                    if cache is None:
+                        result = engine(page_refs, num_frames, monitor)
+                    else:
+                        result = cache.fetch(digest, num_frames, algo, mode,
+                                             lambda: engine(page_refs, num_frames, monitor))
+                else:
+                    engine, refs = self.engines.get(algo), appended
+                    if mode == "stats" and engine is not None and engine.history is not None:
+                        self._release(algo, cache)  # No longer selected
+                    cached = None
+                    if mode == "full" and (engine is None or engine.history is None):
+                        cached = cache.get(digest, num_frames, algo, mode) if cache is not None else None
+                        if cached is None:
+                            engine = None  # Rebuilt with a history below
+                    if engine is None:
+                        engine = self.engines[algo] = resumable_engine(
+                            algo, num_frames, keep_history=mode == "full" and cached is None)
+                        refs = page_refs
+                    result = engine.feed(refs, monitor).snapshot()
+                    if cached is not None:
+                        result = cached  # The engine keeps counting stats-only
+                if algo == selected_algo:
+                    selected = result
+                hits, misses = result[1:3] if mode == "full" else result[:2]
+                results[algo] = (misses, hits / (hits + misses))
+        except SimulationCancelled:
+            self.reset()  # Some engines are ahead of the others now
+            raise
+
+        self.page_refs = list(page_refs)
+        return ALGORITHMS, results, selected
@@ -0,0 +1,432 @@
+import time
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.ticker import MaxNLocator, ScalarFormatter
+
+# Matplotlib views of simulation results. Only imported when something is
+# actually plotted, so headless runs never pay for matplotlib.
+
+# ------------------ Frame Table Visualization ------------------
+def visualize_page_replacement(algorithm, pages, frames, history, fault_positions, hits, misses):
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.set_title(f'{algorithm} Page Replacement Visualization', fontsize=16, fontweight='bold')
+    num_steps = len(pages)
+    num_frames = frames
+    
+    # Table Data Setup
+    table_data = [[''] * num_steps for _ in range(num_frames)]
+    cell_colors = [['white'] * num_steps for _ in range(num_frames)]
+    replaced_positions = {pos[0]: (pos[1], pos[2]) for pos in fault_positions}
+    
+    for col, frame_state in enumerate(history):
+        for row in range(num_frames):
+            if row < len(frame_state):
+                table_data[row][col] = str(frame_state[row])
+                if col in replaced_positions and row == replaced_positions[col][1]:
+                    cell_colors[row][col] = 'red'  # Highlight replaced pages
+                else:
+                    cell_colors[row][col] = 'lightblue'
+    
+    table_data = np.array(table_data)
+    ax.axis('tight')
+    ax.axis('off')
+    ax.table(cellText=table_data, cellLoc='center', loc='center',
+             cellColours=cell_colors, colLabels=[str(p) for p in pages],
+             colColours=['lightblue'] * num_steps)
+    plt.show()
+
+# ------------------ Scalable History Visualization ------------------
+TABLE_STEP_LIMIT = 60  # Longer runs use the viewport viewer instead of ax.table
+CELL_STEP_LIMIT = 200  # Widest window drawn as exact per-step cells
+LABEL_STEP_LIMIT = 40  # Widest window that gets page numbers written in the cells
+
+
+def visualize_history_viewport(algorithm, history, pages=None, fault_positions=(), initial_steps=CELL_STEP_LIMIT):
+    # Renders only what is on screen. Zoomed in, the visible steps are replayed
+    # from the compact history as exact cells; zoomed out, one sampled frame state
+    # is drawn per pixel column and the lower strip shows faults per reference.
+    fig, (ax, ax_faults) = plt.subplots(2, 1, figsize=(12, 6), gridspec_kw={"height_ratios": [4, 1]})
+    fig.suptitle(f'{algorithm} Page Replacement Visualization', fontsize=16, fontweight='bold')
+
+    num_steps = len(history)
+    rows = max(history.occupied, 1)
+    event_steps = np.asarray(history.steps, dtype=np.int64)  # Every page fault, cold ones included
+    all_pages = np.asarray(history.pages, dtype=np.int64)
+    vmin, vmax = (int(all_pages.min()), int(all_pages.max())) if len(all_pages) else (0, 1)
+    replaced = {step: slot for step, _, slot in fault_positions}
+
+    cmap = plt.get_cmap("Blues").copy()
+    cmap.set_bad("white")  # Empty frames
+    image = ax.imshow(np.ma.masked_all((rows, 1)), cmap=cmap, vmin=vmin, vmax=vmax,
+                      aspect="auto", interpolation="nearest")
+    density_line, = ax_faults.plot([], [], color="red", drawstyle="steps-post")
+    ax.set_yticks(range(rows))
+    ax.set_yticklabels([f"Frame {i+1}" for i in range(rows)])
+    ax.xaxis.tick_top()
+    ax_faults.set_ylim(0, 1.05)
+    ax_faults.set_ylabel("Faults / ref")
+    ax_faults.set_xlabel("Step")
+    overlays = []  # Cell labels and replacement markers of the current window
+    state = {"drawing": False}
+
+    def reset_ticks():
+        ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+        ax.xaxis.set_major_formatter(ScalarFormatter())
+
+    def render(lo, hi):
+        lo, hi = max(0, int(np.floor(lo))), min(num_steps, int(np.ceil(hi)))
+        if hi <= lo:
+            return
+        for artist in overlays:
+            artist.remove()
+        overlays.clear()
+
+        span = hi - lo
+        columns = max(1, int(ax.bbox.width))
+        if span <= min(columns, CELL_STEP_LIMIT):
+            # Exact cells for the visible window only
+            grid = np.full((rows, span), -1, dtype=np.int64)
+            for col, frame_state in enumerate(history.window(lo, hi)):
+                grid[:len(frame_state), col] = frame_state
+            edges = np.arange(lo, hi + 1)
+
+            if span <= LABEL_STEP_LIMIT:
+                for col in range(span):
+                    for row in range(rows):
+                        if grid[row, col] >= 0:
+                            overlays.append(ax.text(lo + col, row, str(grid[row, col]), ha="center", va="center", fontsize=8))
+                    if lo + col in replaced:
+                        overlays.append(ax.add_patch(plt.Rectangle((lo + col - 0.5, replaced[lo + col] - 0.5), 1, 1,
+                                                                   fill=False, edgecolor="red", linewidth=2)))
+                if pages is not None:
+                    ax.set_xticks(range(lo, hi))
+                    ax.set_xticklabels([str(pages[step]) for step in range(lo, hi)], fontsize=8)
+            else:
+                reset_ticks()
+        else:
+            # One sampled state per pixel column
+            edges = np.linspace(lo, hi, columns + 1)
+            samples = edges[:-1].astype(np.int64)
+            grid = np.full((rows, columns), -1, dtype=np.int64)
+            prev_step, frame_state = None, []
+            for col, step in enumerate(samples):
+                if step != prev_step:
+                    frame_state, prev_step = history[step], step
+                grid[:len(frame_state), col] = frame_state
+            reset_ticks()
+
+        # Faults per reference in each column (0/1 per step when zoomed in)
+        counts, _ = np.histogram(event_steps, bins=edges)
+        density = counts / np.diff(edges)
+        density_line.set_data(edges, np.append(density, density[-1]))
+        ax_faults.set_xlim(edges[0] - 0.5, edges[-1] - 0.5)
+
+        image.set_data(np.ma.masked_less(grid, 0))
+        image.set_extent((edges[0] - 0.5, edges[-1] - 0.5, rows - 0.5, -0.5))
+
+    def on_xlim_changed(axes):
+        if state["drawing"]:
+            return
+        state["drawing"] = True
+        try:
+            render(*axes.get_xlim())
+            fig.canvas.draw_idle()
+        finally:
+            state["drawing"] = False
+
+    ax.set_xlim(-0.5, min(num_steps, initial_steps) - 0.5)
+    ax.set_ylim(rows - 0.5, -0.5)
+    ax.set_autoscale_on(False)
+    ax.callbacks.connect("xlim_changed", on_xlim_changed)
+    on_xlim_changed(ax)
+
+    plt.show()
+
+
+# ------------------ Performance Visualization ------------------
+def visualize_performance(algorithms, page_faults, hit_ratios):
+    fig, axes = plt.subplots(1, 2, figsize=(12, 5))
+    
+    # Bar Chart for Page Faults
+    axes[0].bar(algorithms, page_faults, color=['blue', 'green', 'orange', 'purple', 'brown'])
+    axes[0].set_title("Page Faults Comparison", fontsize=14)
+    axes[0].set_ylabel("Page Faults")
+    
+    # Line Chart for Hit Ratios
+    axes[1].plot(algorithms, hit_ratios, marker='o', linestyle='-', color='red')
+    axes[1].set_title("Hit Ratio Comparison", fontsize=14)
+    axes[1].set_ylabel("Hit Ratio")
+    
+    plt.show()
+
+def visualize_miss_ratio_curve(page_refs, curves, selected_frames=None):
+    fig, axes = plt.subplots(1, 2, figsize=(12, 5))
+    total = len(page_refs)
+
+    for algo, curve in curves.items():
+        frame_counts = range(1, len(curve) + 1)
+        axes[0].plot(frame_counts, curve, marker='.', linestyle='-', label=algo)
+        axes[1].plot(frame_counts, [f / total for f in curve], marker='.', linestyle='-', label=algo)
+
+    axes[0].set_title("Page Faults vs Frames", fontsize=14)
+    axes[0].set_xlabel("Frames")
+    axes[0].set_ylabel("Page Faults")
+    axes[1].set_title("Miss Ratio Curve", fontsize=14)
+    axes[1].set_xlabel("Frames")
+    axes[1].set_ylabel("Miss Ratio")
+
+    for ax in axes:
+        if selected_frames:
+            ax.axvline(selected_frames, color='gray', linestyle='--')
+        ax.legend()
+
+    plt.show()
+
+def visualize_memory_utilization(page_refs, frames):
+    utilization = [min(i + 1, frames) for i in range(len(page_refs))]
+    plt.figure(figsize=(8, 5))
+    plt.plot(range(1, len(page_refs) + 1), utilization, marker='o', linestyle='-', color='purple')
+    plt.xlabel("Time Steps")
+    plt.ylabel("Frames Occupied")
+    plt.title("Memory Utilization Over Time")
+    plt.show()
+
+# ------------------ Animated Replay ------------------
+ANIMATION_INTERVAL_MS = 30  # Timer period; several steps are applied per tick at high speeds
+ANIMATION_SLOT_LIMIT = 256  # More frames than this are left to the viewport viewer
+ANIMATION_SLOTS_PER_COLUMN = 16
+MAX_STEPS_PER_SECOND = 20000
+
+
+def animate_page_replacement(algorithm, history, pages=None, fault_positions=(), steps_per_second=20):
+    # Step-by-step replay with FuncAnimation blitting. Every frame slot is its
+    # own small axes, so a tick restores and redraws only the slots that changed
+    # (plus the ones highlighted on the previous tick), the status line and the
+    # progress bar; the rest of the figure is never re-rendered while playing.
+    # Controls: Play/Pause, Slower/Faster (x2), click or drag the progress bar to
+    # seek; keys: space, left/right (one step), up/down (speed), home/end.
+    from matplotlib.animation import FuncAnimation
+    from matplotlib.widgets import Button
+
+    num_steps = len(history)
+    num_slots = max(history.occupied, 1)
+    if not num_steps:
+        raise ValueError("the history is empty; there is nothing to animate")
+    if num_slots > ANIMATION_SLOT_LIMIT:
+        raise ValueError(f"{num_slots} frames are too many to animate; use visualize_history_viewport")
+    event_steps = np.asarray(history.steps, dtype=np.int64)
+    event_slots = np.asarray(history.slots, dtype=np.int64)
+    event_pages = np.asarray(history.pages, dtype=np.int64)
+    replaced_steps = np.sort(np.fromiter((step for step, _, _ in fault_positions), dtype=np.int64))
+
+    columns = -(-num_slots // ANIMATION_SLOTS_PER_COLUMN)
+    rows = min(num_slots, ANIMATION_SLOTS_PER_COLUMN)
+    fig = plt.figure(figsize=(max(6, 2.2 * columns + 2), max(4, 0.45 * rows + 2.5)))
+    fig.suptitle(f'{algorithm} Page Replacement Replay', fontsize=16, fontweight='bold')
+
+    # Slot cells: a rectangle and a label per slot, animated from the start so the
+    # cached backgrounds never contain them
+    cells, labels = [], []
+    grid_top, grid_bottom = 0.86, 0.2
+    row_height = (grid_top - grid_bottom) / rows
+    column_width = 0.8 / columns
+    for slot in range(num_slots):
+        column, row = divmod(slot, rows)
+        ax = fig.add_axes((0.12 + column * column_width, grid_top - (row + 1) * row_height,
+                           column_width * 0.6, row_height * 0.9))
+        ax.set_axis_off()
+        ax.text(-0.05, 0.5, f"Frame {slot + 1}", transform=ax.transAxes, ha="right", va="center", fontsize=8)
+        cell = ax.add_patch(plt.Rectangle((0.03, 0.06), 0.94, 0.88, transform=ax.transAxes,
+                                          facecolor="white", edgecolor="gray", animated=True))
+        label = ax.text(0.5, 0.5, "", transform=ax.transAxes, ha="center", va="center",
+                        fontsize=10, animated=True)
+        cells.append(cell)
+        labels.append(label)
+
+    status_ax = fig.add_axes((0.05, 0.11, 0.9, 0.05))
+    status_ax.set_axis_off()
+    status = status_ax.text(0, 0.5, "", va="center", family="monospace", fontsize=9, animated=True)
+    progress_ax = fig.add_axes((0.05, 0.08, 0.9, 0.025))
+    progress_ax.set_xlim(0, 1)
+    progress_ax.set_ylim(0, 1)
+    progress_ax.set_xticks([])
+    progress_ax.set_yticks([])
+    progress = progress_ax.add_patch(plt.Rectangle((0, 0), 0, 1, facecolor="steelblue", animated=True))
+
+    view = {
+        "position": 0,  # Step shown
+        "event": 0,  # First event after the shown step
+        "state": [],  # Page in each slot
+        "slot_of": {},  # page -> slot
+        "playing": False,
+        "speed": float(steps_per_second),
+        "budget": 0.0,  # Fractional steps owed to the timer
+        "last_tick": None,
+        "highlighted": set(),  # Slots drawn highlighted on the last tick
+        "redraw_all": True,
+        "dragging": False,
+    }
+
+    def seek(step):
+        step = int(min(max(step, 0), max(num_steps - 1, 0)))
+        state = history[step] if num_steps else []
+        view.update(position=step, state=list(state), slot_of={page: slot for slot, page in enumerate(state)},
+                    event=int(np.searchsorted(event_steps, step, side="right")), redraw_all=True)
+
+    def advance(count):
+        # Applies the events of the next `count` steps; returns {slot: "fill" | "replace"}
+        target = min(view["position"] + count, num_steps - 1)
+        first = view["event"]
+        last = int(np.searchsorted(event_steps, target, side="right"))
+        changed = {}
+        state, slot_of = view["state"], view["slot_of"]
+        lo, hi = np.searchsorted(replaced_steps, [view["position"] + 1, target + 1])
+        replaced = np.isin(event_steps[first:last], replaced_steps[lo:hi])
+        for slot, page, is_replacement in zip(event_slots[first:last].tolist(), event_pages[first:last].tolist(),
+                                              replaced.tolist()):
+            if slot == len(state):
+                state.append(page)
+            else:
+                slot_of.pop(state[slot], None)
+                state[slot] = page
+            slot_of[page] = slot
+            changed[slot] = "replace" if is_replacement else "fill"
+        view.update(position=target, event=last)
+        return changed
+
+    def paint(slot, mark=None):
+        state = view["state"]
+        page = state[slot] if slot < len(state) else None
+        labels[slot].set_text("" if page is None else str(page))
+        color = {"replace": "salmon", "fill": "lightgreen"}.get(mark, "white" if page is None else "lightblue")
+        cells[slot].set_facecolor(color)
+        cells[slot].set_edgecolor("green" if mark == "hit" else "gray")
+        cells[slot].set_linewidth(3 if mark == "hit" else 1)
+        return [cells[slot], labels[slot]]
+
+    def update_status():
+        step = view["position"]
+        faults = int(np.searchsorted(event_steps, step, side="right"))
+        ref = f"ref {pages[step]}" if pages is not None and num_steps else ""
+        outcome = "FAULT" if faults and event_steps[faults - 1] == step else "hit"
+        status.set_text(f"step {step + 1}/{num_steps}  {ref}  {outcome:<5}  faults {faults}  hits {step + 1 - faults}"
+                        f"  {view['speed']:g} steps/s  {'playing' if view['playing'] else 'paused'}")
+        progress.set_width((step + 1) / num_steps if num_steps else 0)
+        return [status, progress]
+
+    def tick(_):
+        now = time.perf_counter()
+        marks = {}
+        if view["playing"] and num_steps:
+            view["budget"] += view["speed"] * (now - (view["last_tick"] or now))
+            count = int(view["budget"])
+            if count:
+                view["budget"] -= count
+                marks = advance(count)
+                if view["position"] >= num_steps - 1:
+                    view["playing"] = False
+            if not marks and count and pages is not None:
+                slot = view["slot_of"].get(int(pages[view["position"]]))
+                if slot is not None:
+                    marks = {slot: "hit"}
+        view["last_tick"] = now
+
+        if view["redraw_all"]:
+            view["redraw_all"] = False
+            dirty = range(num_slots)
+        else:
+            # Slots highlighted last tick go back to their plain colors
+            dirty = set(marks) | view["highlighted"]
+        view["highlighted"] = set(marks)
+        artists = update_status()
+        for slot in dirty:
+            artists += paint(slot, marks.get(slot))
+        return artists
+
+    def toggle(_=None):
+        if not view["playing"] and view["position"] >= num_steps - 1:
+            seek(0)
+        view["playing"] = not view["playing"]
+        view["budget"] = 0.0
+
+    def change_speed(factor):
+        view["speed"] = min(max(view["speed"] * factor, 0.25), MAX_STEPS_PER_SECOND)
+
+    def step_by(delta):
+        view["playing"] = False
+        seek(view["position"] + delta)
+
+    def on_key(event):
+        actions = {
+            " ": toggle, "right": lambda: step_by(1), "left": lambda: step_by(-1),
+            "up": lambda: change_speed(2), "down": lambda: change_speed(0.5),
+            "home": lambda: step_by(-num_steps), "end": lambda: step_by(num_steps),
+        }
+        if event.key in actions:
+            actions[event.key]()
+
+    def on_progress(event):
+        if event.inaxes is progress_ax and event.xdata is not None:
+            seek(event.xdata * num_steps)
+
+    def on_press(event):
+        if event.inaxes is progress_ax:
+            view["dragging"] = True
+            on_progress(event)
+
+    def on_motion(event):
+        if view["dragging"]:
+            on_progress(event)
+
+    def on_release(_):
+        view["dragging"] = False
+
+    def on_draw(_):
+        # A full redraw leaves the animated artists out; repaint them next tick
+        view["redraw_all"] = True
+
+    buttons = []
+    for i, (text, action) in enumerate([("Play/Pause", toggle), ("Slower", lambda _: change_speed(0.5)),
+                                        ("Faster", lambda _: change_speed(2))]):
+        button = Button(fig.add_axes((0.05 + i * 0.16, 0.015, 0.14, 0.05)), text)
+        button.on_clicked(action)
+        buttons.append(button)  # Widgets stop responding once garbage-collected
+    fig.canvas.mpl_connect("key_press_event", on_key)
+    fig.canvas.mpl_connect("button_press_event", on_press)
+    fig.canvas.mpl_connect("motion_notify_event", on_motion)
+    fig.canvas.mpl_connect("button_release_event", on_release)
+    fig.canvas.mpl_connect("draw_event", on_draw)
+
+    seek(0)
+    animation = FuncAnimation(fig, tick, interval=ANIMATION_INTERVAL_MS, blit=True, cache_frame_data=False)
+    animation.buttons = buttons
+    plt.show()
+    return animation
+
+
+# ------------------ Saved Result Replay ------------------
+def replay_result_file(path, animate=False):
+    # Memory-maps a result_file run and shows it like a fresh one: the frame
+    # table for short runs, the viewport viewer otherwise, or the animated replay
+    from result_file import ResultFile
+
+    saved = ResultFile(path)
+    history, hits, misses, fault_positions = saved.result()[:4]
+    pages = saved.references
+    if animate and history.occupied <= ANIMATION_SLOT_LIMIT:
+        animate_page_replacement(saved.algorithm, history, pages, fault_positions)
+    elif pages is not None and len(history) <= TABLE_STEP_LIMIT:
+        visualize_page_replacement(saved.algorithm, pages, saved.frames, history, fault_positions, hits, misses)
+    else:
+        visualize_history_viewport(saved.algorithm, history, pages, fault_positions)
+
+
+def compare_result_files(paths):
+    # Performance comparison from the headers of saved runs (no columns are read)
+    from result_file import ResultFile
+
+    saved = [ResultFile(path) for path in paths]
+    same_frames = len({s.frames for s in saved}) == 1
+    labels = [s.algorithm if same_frames else f"{s.algorithm} ({s.frames})" for s in saved]
+    visualize_performance(labels, [s.misses for s in saved],
+                          [s.hits / (s.hits + s.misses) if s.hits + s.misses else 0.0 for s in saved])
@@ -0,0 +1,65 @@
+import mmap
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+from page_replacement_engines import STATS_ENGINES
+from trace_loader import BINARY_DTYPES, iter_trace_chunks, trace_format, write_int64_trace
+
+# ------------------ Parallel Algorithm x Frame Sweep ------------------
+# Every (algorithm, frames) job runs a statistics-only engine in its own process.
+# The trace is shared as a memory-mapped binary file: binary traces are mapped
+# in place, anything else is written once to a temporary int64 file. Workers see
+# the pages through a memoryview over the mapping, so nothing is pickled per job
+# and the page cache holds a single copy for the whole pool. The CLI's --workers
+# option runs its stats-only grid through sweep().
+
+ITEM_FORMATS = {4: "i", 8: "q"}  # Native memoryview formats; traces are little-endian
+
+
+def _sweep_job(path, itemsize, algorithm, frames):
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            result = STATS_ENGINES[algorithm]([], frames)
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pages = memoryview(mm).cast("B").cast(ITEM_FORMATS[itemsize])
+                try:
+                    result = STATS_ENGINES[algorithm](pages, frames)
+                finally:
+                    pages.release()  # The map cannot close while a view is exported
+    return algorithm, frames, result, time.perf_counter() - start
+
+
+def sweep(trace, frame_counts, algorithms=("FIFO", "LRU", "Optimal"), max_workers=None, fmt=None):
+    # trace: a path to a trace file or an in-memory sequence of page numbers.
+    # Returns (algorithm, frames, stats, seconds) per job, ordered by algorithm
+    # then frames; stats is the stats engine's (hits, misses, evictions[, ghost_hits]).
+    temp_path = None
+    if isinstance(trace, (str, os.PathLike)) and trace_format(os.fspath(trace), fmt) == "binary":
+        path = os.fspath(trace)
+        itemsize = np.dtype(BINARY_DTYPES.get(os.path.splitext(path)[1].lower(), "<i4")).itemsize
+    else:
+        chunks = iter_trace_chunks(os.fspath(trace), fmt=fmt) if isinstance(trace, (str, os.PathLike)) else [trace]
+        path = temp_path = write_int64_trace(chunks)
+        itemsize = 8
+
+    jobs = [(algo, frames) for algo in algorithms for frames in frame_counts]
+    # Optimal is the slowest engine, so start those jobs first
+    jobs.sort(key=lambda job: (job[0] != "Optimal", -job[1]))
+
+    try:
+        rows = []
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_sweep_job, path, itemsize, algo, frames) for algo, frames in jobs]
+            for future in as_completed(futures):
+                rows.append(future.result())
+    finally:
+        if temp_path:
+            os.remove(temp_path)
+
+    order = {algo: i for i, algo in enumerate(algorithms)}
+    rows.sort(key=lambda row: (order[row[0]], row[1]))
+    return rows
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import struct
+import threading
+from array import array
+from collections import OrderedDict
+from frame_history import FrameHistory
+
+# ------------------ Content-Addressed Result Cache ------------------
+# Results are keyed on (trace digest, frames, algorithm, mode), so editing the
+# reference string changes the digest and old entries simply stop matching.
+# Mode is "full" for (history, hits, misses, fault_positions[, ghost_hits]) and
+# "stats" for (hits, misses, evictions[, ghost_hits]).
+#
+# Tier 1 is an in-memory LRU bounded by entry count. Tier 2 (optional) is one
+# file per result: magic, a JSON header with the counters, then the raw history
+# and fault-position arrays.
+
+MAGIC = b"PRC1"
+DIGEST_SIZE = 16
+ARRAY_FIELDS = [  # (name, typecode) of the arrays stored after the header
+    ("event_steps", "q"), ("event_slots", "i"), ("event_pages", "q"),
+    ("fault_steps", "q"), ("fault_pages", "q"), ("fault_slots", "i"),
+]
+
+
+def trace_digest(pages):
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    hasher.update(array('q', pages).tobytes())
+    return hasher.hexdigest()
+
+
+def file_digest(path, chunk_bytes=1 << 22):
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_bytes), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def stats_from_full(result):
+    # A cached full result answers a stats lookup as well
+    stats = (result[1], result[2], len(result[3]))
+    return stats + tuple(result[4:])
+
+
+def encode_result(result, mode):
+    header = {"mode": mode}
+    arrays = []
+    if mode == "full":
+        history, hits, misses, fault_positions = result[:4]
+        header.update(hits=hits, misses=misses, frames=history.frames, length=len(history))
+        faults = list(zip(*fault_positions)) or [(), (), ()]
+        arrays = [history.steps, history.slots, history.pages,
+                  array('q', faults[0]), array('q', faults[1]), array('i', faults[2])]
+        header["counts"] = [len(a) for a in arrays]
+        extra = result[4:]
+    else:
+        header.update(hits=result[0], misses=result[1], evictions=result[2])
+        extra = result[3:]
+    if extra:
+        header["ghost_hits"] = extra[0]
+
+    header_bytes = json.dumps(header).encode()
+    return b"".join([MAGIC, struct.pack("<I", len(header_bytes)), header_bytes] + [a.tobytes() for a in arrays])
+
+
+def decode_result(data):
+    if data[:4] != MAGIC:
+        raise ValueError("not a cached page replacement result")
+    (header_len,) = struct.unpack_from("<I", data, 4)
+    offset = 8 + header_len
+    header = json.loads(data[8:offset])
+    extra = (header["ghost_hits"],) if "ghost_hits" in header else ()
+
+    if header["mode"] != "full":
+        return (header["hits"], header["misses"], header["evictions"]) + extra
+
+    arrays = {}
+    for (name, typecode), count in zip(ARRAY_FIELDS, header["counts"]):
+        values = array(typecode)
+        values.frombytes(data[offset:offset + count * values.itemsize])
+        arrays[name] = values
+        offset += count * values.itemsize
+    history = FrameHistory.from_events(header["frames"], arrays["event_steps"], arrays["event_slots"],
+                                       arrays["event_pages"], header["length"])
+    fault_positions = list(zip(arrays["fault_steps"], arrays["fault_pages"], arrays["fault_slots"]))
+    return (history, header["hits"], header["misses"], fault_positions) + extra
+
+
+class ResultCache:
+    def __init__(self, max_entries=32, directory=None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.entries = OrderedDict()  # key -> result, least recently used first
+        self.lock = threading.Lock()  # The GUI worker thread shares the cache
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        digest, frames, algorithm, mode = key
+        name = "".join(c if c.isalnum() else "_" for c in algorithm)
+        return os.path.join(self.directory, f"{digest}-{name}-{frames}-{mode}.prc")
+
+    def _lookup(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+        if self.directory:
+            try:
+                with open(self._path(key), "rb") as f:
+                    result = decode_result(f.read())
+            except (OSError, ValueError, KeyError):
+                return None
+            self._remember(key, result)
+            return result
+        return None
+
+    def _remember(self, key, result):
+        with self.lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get(self, digest, frames, algorithm, mode):
+        result = self._lookup((digest, frames, algorithm, mode))
+        if result is None and mode == "stats":
+            full = self._lookup((digest, frames, algorithm, "full"))
+            if full is not None:
+                result = stats_from_full(full)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def put(self, digest, frames, algorithm, mode, result):
+        key = (digest, frames, algorithm, mode)
+        self._remember(key, result)
+        if self.directory:
+            path = self._path(key)
+            with open(path + ".tmp", "wb") as f:
+                f.write(encode_result(result, mode))
+            os.replace(path + ".tmp", path)  # Readers never see a half-written file
+
+    def fetch(self, digest, frames, algorithm, mode, compute):
+        # Cached result, or compute() stored under the key
+        result = self.get(digest, frames, algorithm, mode)
+        if result is None:
+            result = compute()
+            self.put(digest, frames, algorithm, mode, result)
+        return result
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
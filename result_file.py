@@ -0,0 +1,323 @@
+import json
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+import numpy as np
+
+from frame_history import FrameHistory
+from page_replacement_engines import resumable_engine
+
+# ------------------ Columnar Result Files ------------------
+# One simulation run on disk, laid out for memory-mapped replay:
+#   magic, uint32 header length, JSON header, padding to 8 bytes, then columns
+# The header holds the counters and {column: [byte offset, count]}; every column
+# is a flat int32 (or int64) array:
+#   refs                                       referenced page per step (optional)
+#   event_steps, event_slots, event_pages      history events, one per fault
+#   fault_steps, fault_pages, fault_slots      replacements (fault_positions)
+# ResultWriter is handed to a resumable engine as its history and fault list, so
+# columns are written while the simulation runs: each goes to its own spill file
+# in buffered blocks, and close() writes the header and appends the columns.
+# ResultFile maps the file back; its history rebuilds any step from NumPy
+# checkpoints, so the visualizers replay a run without simulating it again.
+
+MAGIC = b"PRR1"
+COLUMNS = ["refs", "event_steps", "event_slots", "event_pages", "fault_steps", "fault_pages", "fault_slots"]
+TYPECODES = {"int32": "i", "int64": "q"}
+FLUSH_ITEMS = 1 << 16  # Buffered values per column before a spill write
+
+
+class _FaultLog:
+    # Stands in for the engine's fault_positions list
+    def __init__(self, writer):
+        self.writer = writer
+        self.count = 0
+
+    def append(self, fault):
+        step, page, slot = fault
+        self.writer._append("fault_steps", step)
+        self.writer._append("fault_pages", page)
+        self.writer._append("fault_slots", slot)
+        self.count += 1
+
+    def __len__(self):
+        return self.count
+
+
+class ResultWriter:
+    def __init__(self, path, algorithm, frames, dtype="int32"):
+        if dtype not in TYPECODES:
+            raise ValueError(f"dtype must be one of {sorted(TYPECODES)}, not {dtype}")
+        self.path = path
+        self.algorithm = algorithm
+        self.frames = frames
+        self.dtype = dtype
+        self.length = 0
+        self.occupied = 0
+        self.lookahead = None  # Optimal's bounded lookahead, if the run had one
+        self.fault_positions = _FaultLog(self)
+        self._buffers = {name: array(TYPECODES[dtype]) for name in COLUMNS}
+        self._counts = dict.fromkeys(COLUMNS, 0)
+        self._spills = {}
+        directory = os.path.dirname(os.path.abspath(path))
+        for name in COLUMNS:
+            fd, spill = tempfile.mkstemp(suffix=f".{name}.part", dir=directory)
+            self._spills[name] = (spill, os.fdopen(fd, "wb"))
+
+    def _append(self, name, value):
+        buffer = self._buffers[name]
+        try:
+            buffer.append(value)
+        except OverflowError:
+            raise ValueError(f"{value} does not fit in {self.dtype}; write the result with dtype='int64'") from None
+        if len(buffer) >= FLUSH_ITEMS:
+            self._flush(name)
+
+    def _flush(self, name):
+        buffer = self._buffers[name]
+        self._spills[name][1].write(buffer.tobytes())
+        self._counts[name] += len(buffer)
+        del buffer[:]
+
+    # FrameHistory interface used by the engines
+    def record(self, step, slot, page):
+        self._append("event_steps", step)
+        self._append("event_slots", slot)
+        self._append("event_pages", page)
+        if slot == self.occupied:
+            self.occupied += 1
+        if step >= self.length:
+            self.length = step + 1
+
+    def finish(self, steps):
+        self.length = max(self.length, steps)
+
+    def __len__(self):
+        return self.length
+
+    def write_refs(self, pages):
+        values = np.asarray(pages, dtype=np.int64)
+        if values.size:
+            limits = np.iinfo(self.dtype)
+            if values.min() < limits.min or values.max() > limits.max:
+                raise ValueError(f"page numbers do not fit in {self.dtype}; write the result with dtype='int64'")
+            self._flush("refs")
+            self._spills["refs"][1].write(values.astype(self.dtype).tobytes())
+            self._counts["refs"] += values.size
+
+    def close(self, hits, misses, evictions=None, ghost_hits=None):
+        for name in COLUMNS:
+            self._flush(name)
+            self._spills[name][1].close()
+
+        itemsize = array(TYPECODES[self.dtype]).itemsize
+        header = {
+            "algorithm": self.algorithm, "frames": self.frames, "length": self.length,
+            "hits": hits, "misses": misses,
+            "evictions": self._counts["fault_steps"] if evictions is None else evictions,
+            "dtype": self.dtype, "byteorder": sys.byteorder, "columns": {},
+        }
+        if ghost_hits is not None:
+            header["ghost_hits"] = ghost_hits
+        if self.lookahead is not None:
+            header["lookahead"] = self.lookahead
+        # Offsets depend on the header's own length; repeat until it stops changing
+        header_bytes = b""
+        while True:
+            offset = -(-(len(MAGIC) + 4 + len(header_bytes)) // 8) * 8
+            for name in COLUMNS:
+                header["columns"][name] = [offset, self._counts[name]]
+                offset += self._counts[name] * itemsize
+            encoded = json.dumps(header).encode()
+            if len(encoded) == len(header_bytes):
+                header_bytes = encoded
+                break
+            header_bytes = encoded
+        start = len(MAGIC) + 4 + len(header_bytes)
+
+        try:
+            with open(self.path + ".tmp", "wb") as out:
+                out.write(MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes)
+                out.write(b"\0" * (header["columns"][COLUMNS[0]][0] - start))
+                for name in COLUMNS:
+                    with open(self._spills[name][0], "rb") as spill:
+                        shutil.copyfileobj(spill, out, 1 << 22)
+            os.replace(self.path + ".tmp", self.path)  # Readers never see a half-written file
+        finally:
+            self._remove_spills()
+
+    def abort(self):
+        for _, f in self._spills.values():
+            f.close()
+        self._remove_spills()
+
+    def _remove_spills(self):
+        for spill, _ in self._spills.values():
+            try:
+                os.remove(spill)
+            except OSError:
+                pass
+
+
+def record_run(path, algorithm, frames, chunks, keep_refs=True, lookahead=None, dtype="int32", monitor=None,
+               next_use=None):
+    # Simulates chunk by chunk, streaming the result into `path`; returns the
+    # engine's stats tuple (hits, misses, evictions[, ghost_hits]). Optimal
+    # buffers the whole trace unless it gets a lookahead (an approximation, noted
+    # in the header) or next_use, e.g. OutOfCoreTrace.next_use (exact).
+    writer = ResultWriter(path, algorithm, frames, dtype)
+    try:
+        engine = resumable_engine(algorithm, frames, keep_history=True, lookahead=lookahead, next_use=next_use)
+        writer.lookahead = getattr(engine, "lookahead", None)
+        engine.history, engine.fault_positions = writer, writer.fault_positions
+        for chunk in chunks:
+            chunk = chunk.tolist() if hasattr(chunk, "tolist") else list(chunk)
+            if keep_refs:
+                writer.write_refs(chunk)
+            engine.feed(chunk, monitor)
+        result = engine.finish()
+    except BaseException:
+        writer.abort()
+        raise
+    hits, misses = result[1:3]
+    ghost_hits = result[4] if len(result) > 4 else None
+    writer.close(hits, misses, len(writer.fault_positions), ghost_hits)
+    stats = (hits, misses, len(writer.fault_positions))
+    return stats if ghost_hits is None else stats + (ghost_hits,)
+
+
+def write_result(path, algorithm, result, pages=None, dtype="int32"):
+    # Saves a finished engine result (history, hits, misses, fault_positions[, ghost_hits])
+    history, hits, misses, fault_positions = result[:4]
+    writer = ResultWriter(path, algorithm, history.frames, dtype)
+    try:
+        if pages is not None:
+            writer.write_refs(pages)
+        for step, slot, page in zip(history.steps, history.slots, history.pages):
+            writer.record(step, slot, page)
+        for fault in fault_positions:
+            writer.fault_positions.append(fault)
+        writer.finish(len(history))
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close(hits, misses, len(fault_positions), result[4] if len(result) > 4 else None)
+
+
+class MappedFrameHistory(FrameHistory):
+    # Read-only FrameHistory over (memory-mapped) event columns. Checkpoints are
+    # dense NumPy states built in one vectorized pass, and a step is rebuilt by
+    # applying the events since its checkpoint with NumPy (last write wins).
+    def __init__(self, frames, steps, slots, pages, length, checkpoint_interval=None):
+        super().__init__(frames, checkpoint_interval or max(4096, frames))
+        self.steps, self.slots, self.pages = steps, slots, pages
+        self.length = length
+        self._occupied = int(slots.max()) + 1 if len(slots) else 0
+        self._dense_checkpoints = []  # (state with -1 for empty slots, occupied) before events 0, K, 2K, ...
+        state, occupied = np.full(max(frames, self._occupied), -1, dtype=np.int64), 0
+        for start in range(0, len(steps), self.checkpoint_interval):
+            self._dense_checkpoints.append((state.copy(), occupied))
+            occupied = self._apply(state, occupied, start, start + self.checkpoint_interval)
+        self._dense_checkpoints.append((state, occupied))
+
+    def _apply(self, state, occupied, start, end):
+        slots = np.asarray(self.slots[start:end])
+        if not slots.size:
+            return occupied
+        last, first = np.unique(slots[::-1], return_index=True)  # Last write to each slot
+        state[last] = np.asarray(self.pages[start:end])[::-1][first]
+        return max(occupied, int(last[-1]) + 1)
+
+    def record(self, step, slot, page):
+        raise TypeError("a mapped frame history is read-only")
+
+    @property
+    def occupied(self):
+        return self._occupied
+
+    def __getitem__(self, step):
+        if step < 0:
+            step += self.length
+        if not 0 <= step < self.length:
+            raise IndexError("history step out of range")
+        # Keys in the column's dtype, so NumPy does not convert the whole column
+        end = int(np.searchsorted(self.steps, np.asarray(step, self.steps.dtype), side="right"))
+        checkpoint = end // self.checkpoint_interval
+        state, occupied = self._dense_checkpoints[checkpoint]
+        state = state.copy()
+        occupied = self._apply(state, occupied, checkpoint * self.checkpoint_interval, end)
+        return state[:occupied].tolist()
+
+    def window(self, start, stop):
+        stop = min(stop, self.length)
+        if start >= stop:
+            return
+        state = self[start]
+        yield list(state)
+        first, last = np.searchsorted(self.steps, np.asarray([start + 1, stop], self.steps.dtype))
+        steps = self.steps[first:last].tolist()
+        slots = self.slots[first:last].tolist()
+        pages = self.pages[first:last].tolist()
+        e = 0
+        for step in range(start + 1, stop):
+            while e < len(steps) and steps[e] == step:
+                if slots[e] == len(state):
+                    state.append(pages[e])
+                else:
+                    state[slots[e]] = pages[e]
+                e += 1
+            yield list(state)
+
+
+class ResultFile:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            prefix = f.read(len(MAGIC) + 4)
+            if prefix[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a page replacement result file")
+            (header_len,) = struct.unpack_from("<I", prefix, len(MAGIC))
+            self.header = json.loads(f.read(header_len))
+        header = self.header
+        self.algorithm, self.frames = header["algorithm"], header["frames"]
+        self.hits, self.misses, self.evictions = header["hits"], header["misses"], header["evictions"]
+        self.ghost_hits = header.get("ghost_hits")
+        self.lookahead = header.get("lookahead")  # Set when Optimal's faults are an upper bound
+
+        dtype = np.dtype(header["dtype"]).newbyteorder("<" if header["byteorder"] == "little" else ">")
+        data = np.memmap(path, dtype=np.uint8, mode="r") if os.path.getsize(path) else np.empty(0, np.uint8)
+        self.columns = {}
+        for name, (offset, count) in header["columns"].items():
+            self.columns[name] = data[offset:offset + count * dtype.itemsize].view(dtype)
+        self._history = None
+
+    @property
+    def references(self):
+        # Referenced pages, or None if the run was saved without them
+        refs = self.columns["refs"]
+        return refs if len(refs) or not self.header["length"] else None
+
+    @property
+    def history(self):
+        if self._history is None:
+            c = self.columns
+            self._history = MappedFrameHistory(self.frames, c["event_steps"], c["event_slots"],
+                                               c["event_pages"], self.header["length"])
+        return self._history
+
+    @property
+    def fault_positions(self):
+        c = self.columns
+        return list(zip(c["fault_steps"].tolist(), c["fault_pages"].tolist(), c["fault_slots"].tolist()))
+
+    def result(self):
+        # Same tuple as the engine that produced the file
+        result = (self.history, self.hits, self.misses, self.fault_positions)
+        return result if self.ghost_hits is None else result + (self.ghost_hits,)
+
+    def stats(self):
+        stats = (self.hits, self.misses, self.evictions)
+        return stats if self.ghost_hits is None else stats + (self.ghost_hits,)
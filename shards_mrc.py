@@ -0,0 +1,189 @@
+import heapq
+import math
+import os
+import numpy as np
+
+from trace_loader import DEFAULT_CHUNK, iter_trace_chunks
+
+# ------------------ Approximate Miss-Ratio Curves (SHARDS) ------------------
+# Spatially hashed sampling (Waldspurger et al., FAST '15). A page is sampled
+# when hash(page) < T, so either every reference to a page is seen or none is.
+# With sampling rate R = T / 2^64, LRU stack distances measured on the sample
+# are divided by R to estimate the distances in the full trace.
+#
+# Hashing and filtering run on whole NumPy chunks, so only sampled references
+# reach Python. With max_pages set (fixed-size SHARDS), T is lowered whenever
+# more pages than that are sampled, evicting the page with the largest hash.
+# Memory then depends on max_pages and max_frames, not on trace length.
+#
+# Scaled depths are multiples of 1 / R frames, so the estimate is only meaningful
+# for frame counts well above that (rate=0.01 resolves steps of about 100 frames).
+
+HASH_SPACE = 1 << 64
+MIX_1 = np.uint64(0xBF58476D1CE4E5B9)  # splitmix64 finalizer constants
+MIX_2 = np.uint64(0x94D049BB133111EB)
+GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+GROUPS = 16  # Sampled pages are split into hash groups for the error estimate
+T_95 = 2.131  # Student t, 95% two-sided, GROUPS - 1 degrees of freedom
+
+
+def page_hashes(pages, seed=0):
+    # Well-mixed 64-bit hash of every page number in an integer array
+    with np.errstate(over="ignore"):
+        h = np.asarray(pages).astype(np.uint64) + GOLDEN * np.uint64(seed + 1)
+        h = (h ^ (h >> np.uint64(30))) * MIX_1
+        h = (h ^ (h >> np.uint64(27))) * MIX_2
+        return h ^ (h >> np.uint64(31))
+
+
+class _SampledLruStack:
+    # LRU stack depths of the sampled pages. A Fenwick tree marks each page's
+    # last-use slot; when the slots run out the live pages are renumbered in
+    # order, so the tree stays at twice the number of tracked pages.
+    def __init__(self):
+        self.last_use = {}  # page -> slot of its latest reference
+        self.size = 1024
+        self.tree = [0] * (self.size + 1)
+        self.clock = 0
+
+    def _add(self, pos, delta):
+        tree, pos = self.tree, pos + 1
+        while pos <= self.size:
+            tree[pos] += delta
+            pos += pos & -pos
+
+    def _prefix(self, pos):
+        tree, total = self.tree, 0
+        while pos > 0:
+            total += tree[pos]
+            pos -= pos & -pos
+        return total
+
+    def _compact(self):
+        live = sorted(self.last_use, key=self.last_use.get)
+        self.size = max(1024, 2 * len(live))
+        self.tree = [0] * (self.size + 1)
+        for pos, page in enumerate(live):
+            self.last_use[page] = pos
+            self._add(pos, 1)
+        self.clock = len(live)
+
+    def access(self, page):
+        # Stack depth of page (1 = most recently used), or 0 on first reference
+        if self.clock == self.size:
+            self._compact()
+        prev = self.last_use.get(page)
+        depth = 0
+        if prev is not None:
+            depth = self._prefix(self.clock) - self._prefix(prev)
+            self._add(prev, -1)
+        self._add(self.clock, 1)
+        self.last_use[page] = self.clock
+        self.clock += 1
+        return depth
+
+    def remove(self, page):
+        prev = self.last_use.pop(page, None)
+        if prev is not None:
+            self._add(prev, -1)
+
+
+def miss_curve(hist, max_frames):
+    # Weighted misses at every frame count 1..max_frames from a depth histogram
+    curve = [0.0] * max_frames
+    deeper = hist[0] + hist[max_frames + 1]
+    for k in range(max_frames, 0, -1):
+        curve[k - 1] = deeper
+        deeper += hist[k]
+    return curve
+
+
+def _page_chunks(source, chunk_size, fmt):
+    if isinstance(source, (str, os.PathLike)):
+        return iter_trace_chunks(os.fspath(source), chunk_size, fmt)
+    source = np.asarray(source, dtype=np.int64)
+    return (source[start:start + chunk_size] for start in range(0, len(source), chunk_size))
+
+
+def approximate_miss_ratio_curve(source, max_frames, rate=0.01, max_pages=8192, seed=0,
+                                 chunk_size=DEFAULT_CHUNK, fmt=None):
+    # source: a trace path or an in-memory sequence of page numbers. rate is the
+    # starting sampling rate; max_pages caps the sampled pages (None: fixed rate).
+    # Returns a dict with per-frame-count estimates for k = 1..max_frames:
+    #   faults / lower / upper   estimated LRU faults and a ~95% interval
+    #   miss_ratio               faults / references
+    # plus references, sampled_references, sampled_pages, the final rate and
+    # bounded (False when too few pages were sampled to estimate the error).
+    if not 0 < rate <= 1:
+        raise ValueError("rate must be in (0, 1]")
+    threshold = min(int(rate * HASH_SPACE), HASH_SPACE)
+    stack = _SampledLruStack()
+    group_stacks = [_SampledLruStack() for _ in range(GROUPS)]
+    sampled = []  # Max-heap of (-hash, page) over tracked pages, for fixed-size eviction
+    # hist[d] = weighted references at scaled depth d; [0] holds cold misses and
+    # [-1] depths beyond max_frames. hists[g] is the same for group g on its own.
+    hist = [0.0] * (max_frames + 2)
+    hists = [[0.0] * (max_frames + 2) for _ in range(GROUPS)]
+    references = sampled_references = 0
+
+    for chunk in _page_chunks(source, chunk_size, fmt):
+        references += len(chunk)
+        hashes = page_hashes(chunk, seed)
+        keep = hashes < np.uint64(threshold) if threshold < HASH_SPACE else slice(None)
+        for page, h in zip(np.asarray(chunk)[keep].tolist(), hashes[keep].tolist()):
+            if h >= threshold:  # Threshold dropped earlier in this chunk
+                continue
+            depth = stack.access(page)
+            group = h % GROUPS
+            group_depth = group_stacks[group].access(page)
+            sampled_references += 1
+            scale = HASH_SPACE / threshold  # 1 / R
+            hist[min(math.ceil(depth * scale), max_frames + 1) if depth else 0] += scale
+            group_scale = scale * GROUPS  # Each group samples at R / GROUPS
+            hists[group][min(math.ceil(group_depth * group_scale), max_frames + 1) if group_depth else 0] += group_scale
+            if depth == 0 and max_pages is not None:
+                heapq.heappush(sampled, (-h, page))
+                while len(sampled) > max_pages:
+                    neg_h, evicted = heapq.heappop(sampled)
+                    threshold = -neg_h
+                    stack.remove(evicted)
+                    group_stacks[-neg_h % GROUPS].remove(evicted)
+
+    rate = threshold / HASH_SPACE
+    # SHARDS-adj credits the gap between the sampled weight and the true
+    # reference count to depth 1 (a hit at every size), which amounts to
+    # dividing the weighted misses by the true count
+    curve = miss_curve(hist, max_frames)
+    # Pages, not references, are the sampling unit, and both a few hot pages and
+    # the count of sampled pages (which sets the depth scale) move the estimate.
+    # Each group is an independent SHARDS sample at R / GROUPS, so the spread of
+    # their curves estimates the error of the combined one. With fewer than two
+    # sampled groups there is no spread to measure, and the interval is the
+    # uninformative [0, references] rather than a zero-width one.
+    group_curves = [miss_curve(group, max_frames) for group in hists if sum(group)]
+
+    faults, lower, upper, miss_ratio = [], [], [], []
+    for k, misses in enumerate(curve):
+        ratio = min(max(misses / references, 0.0), 1.0) if references else 0.0
+        margin = 1.0
+        if len(group_curves) > 1:
+            values = [group_curve[k] / references for group_curve in group_curves]
+            mean = sum(values) / len(values)
+            variance = sum((v - mean) ** 2 for v in values) / (len(values) - 1)
+            margin = T_95 * math.sqrt(variance / len(values) * (1 - rate))
+        miss_ratio.append(ratio)
+        faults.append(round(ratio * references))
+        lower.append(round(max(ratio - margin, 0.0) * references))
+        upper.append(round(min(ratio + margin, 1.0) * references))
+
+    return {
+        "references": references,
+        "sampled_references": sampled_references,
+        "sampled_pages": len(stack.last_use),
+        "rate": rate,
+        "bounded": len(group_curves) > 1,
+        "faults": faults,
+        "lower": lower,
+        "upper": upper,
+        "miss_ratio": miss_ratio,
+    }
@@ -0,0 +1,338 @@
+# ------------------ Reference Engines ------------------
+# Slow list-scan implementations the engines are checked against. FIFO, LRU and
+# Optimal are the simulator's original functions, unchanged; the other policies
+# are written from their papers with plain lists and full scans. Every function
+# returns (history, hits, misses, fault_positions[, ghost_hits]) with history a
+# list of frame lists, one per step.
+
+
+def fifo_page_replacement(pages, frames):
+    frame_list = []
+    history = []
+    fault_positions = []
+    hits, misses = 0, 0
+    fifo_index = 0  # Tracks which index to replace
+
+    for i, page in enumerate(pages):
+        if page in frame_list:
+            hits += 1
+        else:
+            misses += 1
+            if len(frame_list) < frames:
+                frame_list.append(page)
+            else:
+                replaced_index = fifo_index  # Get index of oldest page
+                frame_list[replaced_index] = page  # Replace at the same position
+                fault_positions.append((i, page, replaced_index))  # Store step, new page, replaced index
+                fifo_index = (fifo_index + 1) % frames  # Move FIFO pointer
+
+        history.append(frame_list.copy())
+
+    return history, hits, misses, fault_positions
+
+
+def lru_page_replacement(pages, frames):
+    frame_list = []  # Stores pages in memory
+    history = []  # Stores frame state history
+    fault_positions = []  # Stores replaced page details
+    indexes = {}  # Stores last used index of each page
+
+    hits, misses = 0, 0
+
+    for i, page in enumerate(pages):
+        if page in frame_list:
+            hits += 1
+            indexes[page] = i  # Update last used index
+        else:
+            misses += 1
+            if len(frame_list) < frames:
+                frame_list.append(page)  # Add page if space available
+            else:
+                # Find the least recently used page (smallest index in 'indexes')
+                lru_page = min(indexes, key=indexes.get)  # Page with the lowest index
+                replaced_index = frame_list.index(lru_page)  # Find its position in the frame
+                frame_list[replaced_index] = page  # Replace with new page
+                fault_positions.append((i, page, replaced_index))  # Store fault info
+                indexes.pop(lru_page)  # Remove old page from usage tracker
+
+            indexes[page] = i  # Update last used index
+
+        history.append(frame_list.copy())  # Store frame state
+
+    return history, hits, misses, fault_positions
+
+
+def optimal_page_replacement(pages, frames):
+    frame_list = []  # Stores current pages in memory
+    history = []  # Stores state of frames at each step
+    fault_positions = []  # Stores (step, new page, replaced index)
+    hits, misses = 0, 0
+
+    for i, page in enumerate(pages):
+        if page in frame_list:
+            hits += 1  # Page hit
+        else:
+            misses += 1  # Page fault
+
+            if len(frame_list) < frames:
+                frame_list.append(page)  # Fill empty frames first
+            else:
+                # Dictionary to store the next occurrence index of each page in frame
+                future_use = {frame: float('inf') for frame in frame_list}
+
+                for frame in frame_list:
+                    if frame in pages[i+1:]:  # Check if frame appears in future
+                        future_use[frame] = pages[i+1:].index(frame) + i + 1  # Absolute index
+
+                # Find the page that is used farthest in the future
+                page_to_replace = max(future_use, key=future_use.get)
+                replaced_index = frame_list.index(page_to_replace)
+
+                # Replace the page
+                frame_list[replaced_index] = page
+                fault_positions.append((i, page, replaced_index))  # Store replacement step
+
+        history.append(frame_list.copy())
+
+    return history, hits, misses, fault_positions
+
+
+def run_policy(policy, pages, frames):
+    # Drives a reference policy: access(i, page) -> (hit, victim); the new page
+    # takes the victim's slot, or the next free one
+    frame_list = []
+    history = []
+    fault_positions = []
+    hits, misses = 0, 0
+    for i, page in enumerate(pages):
+        hit, victim = policy.access(i, page)
+        if hit:
+            hits += 1
+        else:
+            misses += 1
+            if victim is None:
+                frame_list.append(page)
+            else:
+                slot = frame_list.index(victim)
+                frame_list[slot] = page
+                fault_positions.append((i, page, slot))
+        history.append(frame_list.copy())
+    result = history, hits, misses, fault_positions
+    return result + (policy.ghost_hits,) if hasattr(policy, "ghost_hits") else result
+
+
+class LfuReference:
+    # Fewest references first; among those, the page that reached its count earliest
+    def __init__(self, frames):
+        self.frames = frames
+        self.count = {}
+        self.since = {}  # page -> step of its latest reference
+
+    def access(self, i, page):
+        hit = page in self.count
+        victim = None
+        if not hit and len(self.count) >= self.frames:
+            victim = min(self.count, key=lambda p: (self.count[p], self.since[p]))
+            del self.count[victim], self.since[victim]
+        self.count[page] = self.count.get(page, 0) + 1
+        self.since[page] = i
+        return hit, victim
+
+
+class ClockReference:
+    # Second chance over a circular list of [page, reference bit] slots
+    def __init__(self, frames):
+        self.frames = frames
+        self.slots = []
+        self.hand = 0
+
+    def access(self, i, page):
+        for slot in self.slots:
+            if slot[0] == page:
+                slot[1] = 1
+                return True, None
+        if len(self.slots) < self.frames:
+            self.slots.append([page, 1])
+            return False, None
+        while self.slots[self.hand][1]:
+            self.slots[self.hand][1] = 0
+            self.hand = (self.hand + 1) % self.frames
+        victim = self.slots[self.hand][0]
+        self.slots[self.hand] = [page, 1]
+        self.hand = (self.hand + 1) % self.frames
+        return False, victim
+
+
+class ArcReference:
+    # Megiddo & Modha, FAST '03, Fig. 4; lists are kept LRU first
+    def __init__(self, frames):
+        self.c = frames
+        self.p = 0.0
+        self.t1, self.t2, self.b1, self.b2 = [], [], [], []
+        self.ghost_hits = {"B1": 0, "B2": 0}
+
+    def replace(self, in_b2):
+        if self.t1 and (len(self.t1) > self.p or (in_b2 and len(self.t1) == self.p) or not self.t2):
+            victim = self.t1.pop(0)
+            self.b1.append(victim)
+        else:
+            victim = self.t2.pop(0)
+            self.b2.append(victim)
+        return victim
+
+    def access(self, i, page):
+        t1, t2, b1, b2, c = self.t1, self.t2, self.b1, self.b2, self.c
+        if page in t1 or page in t2:  # Case I
+            (t1 if page in t1 else t2).remove(page)
+            t2.append(page)
+            return True, None
+        full = len(t1) + len(t2) >= c
+        victim = None
+        if page in b1:  # Case II
+            self.ghost_hits["B1"] += 1
+            self.p = min(c, self.p + (1 if len(b1) >= len(b2) else len(b2) / len(b1)))
+            victim = self.replace(False) if full else None
+            b1.remove(page)
+            t2.append(page)
+        elif page in b2:  # Case III
+            self.ghost_hits["B2"] += 1
+            self.p = max(0, self.p - (1 if len(b2) >= len(b1) else len(b1) / len(b2)))
+            victim = self.replace(True) if full else None
+            b2.remove(page)
+            t2.append(page)
+        else:  # Case IV
+            if len(t1) + len(b1) == c:
+                if len(t1) < c:
+                    b1.pop(0)
+                    victim = self.replace(False) if full else None
+                else:
+                    victim = t1.pop(0)
+            elif len(t1) + len(t2) + len(b1) + len(b2) >= c:
+                if len(t1) + len(t2) + len(b1) + len(b2) == 2 * c:
+                    b2.pop(0)
+                victim = self.replace(False) if full else None
+            t1.append(page)
+        return False, victim
+
+
+class TwoQueueReference:
+    # Johnson & Shasha, VLDB '94, full version; A1in and A1out are FIFOs, Am is LRU
+    def __init__(self, frames):
+        self.c = frames
+        self.kin = max(1, frames // 4)
+        self.kout = max(1, frames // 2)
+        self.am, self.a1in, self.a1out = [], [], []
+        self.ghost_hits = {"A1out": 0}
+
+    def reclaim(self):
+        if len(self.am) + len(self.a1in) < self.c:
+            return None
+        if len(self.a1in) > self.kin or not self.am:
+            victim = self.a1in.pop(0)
+            self.a1out.append(victim)
+            if len(self.a1out) > self.kout:
+                self.a1out.pop(0)
+        else:
+            victim = self.am.pop(0)
+        return victim
+
+    def access(self, i, page):
+        if page in self.am:
+            self.am.remove(page)
+            self.am.append(page)
+            return True, None
+        if page in self.a1in:
+            return True, None
+        if page in self.a1out:
+            self.ghost_hits["A1out"] += 1
+            self.a1out.remove(page)
+            victim = self.reclaim()
+            self.am.append(page)
+        else:
+            victim = self.reclaim()
+            self.a1in.append(page)
+        return False, victim
+
+
+class LirsReference:
+    # Jiang & Zhang, SIGMETRICS '02. Stack S is a list (bottom first) and the
+    # resident HIR pages are the FIFO Q; non-resident HIR pages left in S are
+    # ghosts, at most 2 * frames of them (the lowest in S is dropped first).
+    def __init__(self, frames):
+        self.c = frames
+        hirs = max(1, int(frames * 0.01)) if frames > 1 else 0
+        self.lir_limit = frames - hirs
+        self.ghost_limit = max(1, 2 * frames)
+        self.s, self.q, self.lir = [], [], set()
+        self.ghost_hits = {"HIR": 0}
+
+    def prune(self):
+        while self.s and self.s[0] not in self.lir:
+            self.s.pop(0)
+
+    def to_top(self, page):
+        if page in self.s:
+            self.s.remove(page)
+        self.s.append(page)
+
+    def demote_if_needed(self):
+        if len(self.lir) > self.lir_limit:
+            bottom = self.s.pop(0)
+            self.lir.discard(bottom)
+            self.q.append(bottom)
+            self.prune()
+
+    def access(self, i, page):
+        if page in self.lir:
+            self.to_top(page)
+            self.prune()
+            return True, None
+        if page in self.q:
+            if page in self.s:
+                self.to_top(page)
+                self.q.remove(page)
+                self.lir.add(page)
+                self.demote_if_needed()
+            else:
+                self.s.append(page)
+                self.q.remove(page)
+                self.q.append(page)
+            return True, None
+
+        ghost = page in self.s
+        if ghost:
+            self.ghost_hits["HIR"] += 1
+        victim = None
+        if len(self.lir) + len(self.q) >= self.c:
+            if self.q:
+                victim = self.q.pop(0)
+                ghosts = [p for p in self.s if p not in self.lir and p not in self.q and p != page]
+                if len(ghosts) > self.ghost_limit:
+                    self.s.remove(ghosts[0])
+            else:
+                victim = self.s.pop(0)
+                self.lir.discard(victim)
+                self.prune()
+        if page in self.s:  # Still remembered after the eviction
+            self.to_top(page)
+            self.lir.add(page)
+            self.demote_if_needed()
+        elif len(self.lir) < self.lir_limit:
+            self.s.append(page)
+            self.lir.add(page)
+        else:
+            self.s.append(page)
+            self.q.append(page)
+        return False, victim
+
+
+REFERENCE_ENGINES = {
+    "FIFO": fifo_page_replacement,
+    "LRU": lru_page_replacement,
+    "Optimal": optimal_page_replacement,
+    "LFU": lambda pages, frames: run_policy(LfuReference(frames), pages, frames),
+    "Clock": lambda pages, frames: run_policy(ClockReference(frames), pages, frames),
+    "ARC": lambda pages, frames: run_policy(ArcReference(frames), pages, frames),
+    "2Q": lambda pages, frames: run_policy(TwoQueueReference(frames), pages, frames),
+    "LIRS": lambda pages, frames: run_policy(LirsReference(frames), pages, frames),
+}
@@ -0,0 +1,113 @@
+import random
+
+import pytest
+
+from multi_frame_sim import FAULT_CURVES
+from page_replacement_engines import (
+    ALGORITHMS, REPLACEMENT_ENGINES, STATS_ENGINES, miss_ratio_curve, next_use_indices, resumable_engine,
+)
+from reference_engines import REFERENCE_ENGINES
+
+SEEDS = range(25)
+FRAME_COUNTS = [1, 2, 3, 5, 8, 16]
+
+
+def random_trace(rng, max_length=300):
+    # Hot pages mixed with scans longer than the frame counts, so ghost lists,
+    # promotions and Belady-style corner cases all get exercised
+    length = rng.randrange(max_length + 1)
+    alphabet = rng.choice([3, 8, 20, 60])
+    pages = []
+    while len(pages) < length:
+        if rng.random() < 0.2:
+            pages.extend(range(rng.randrange(2 * alphabet)))
+        else:
+            pages.append(rng.randrange(alphabet))
+    return pages[:length]
+
+
+def cases(seed, count=4):
+    rng = random.Random(seed)
+    return [(random_trace(rng), rng.choice(FRAME_COUNTS)) for _ in range(count)]
+
+
+def states(history):
+    return [list(history[step]) for step in range(len(history))]
+
+
+def stats_of(full):
+    return (full[1], full[2], len(full[3])) + tuple(full[4:])
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_full_engine_matches_reference(algorithm, seed):
+    for pages, frames in cases(seed):
+        expected = REFERENCE_ENGINES[algorithm](pages, frames)
+        result = REPLACEMENT_ENGINES[algorithm](pages, frames)
+        assert result[1:3] == expected[1:3]
+        assert [tuple(fault) for fault in result[3]] == expected[3]
+        assert states(result[0]) == expected[0]
+        assert result[4:] == expected[4:]
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_stats_engine_matches_full_engine(algorithm, seed):
+    for pages, frames in cases(seed):
+        full = REPLACEMENT_ENGINES[algorithm](pages, frames)
+        assert STATS_ENGINES[algorithm](pages, frames) == stats_of(full)
+        assert STATS_ENGINES[algorithm](iter(pages), frames) == stats_of(full)
+
+
+def feed_in_pieces(engine, pages, rng):
+    start = 0
+    while start < len(pages):
+        end = start + rng.randrange(1, 40)
+        engine.feed(pages[start:end])
+        start = end
+    return engine.finish()
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_resumable_engine_matches_full_engine(algorithm, seed):
+    rng = random.Random(seed)
+    for pages, frames in cases(seed):
+        full = REPLACEMENT_ENGINES[algorithm](pages, frames)
+        result = feed_in_pieces(resumable_engine(algorithm, frames), pages, rng)
+        assert result[1:3] == full[1:3]
+        assert [tuple(fault) for fault in result[3]] == [tuple(fault) for fault in full[3]]
+        assert states(result[0]) == states(full[0])
+        assert result[4:] == full[4:]
+        stats = feed_in_pieces(resumable_engine(algorithm, frames, keep_history=False), pages, rng)
+        assert stats == stats_of(full)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_next_use_optimal_engines_match_full_engine(seed):
+    rng = random.Random(seed)
+    for pages, frames in cases(seed):
+        full = REPLACEMENT_ENGINES["Optimal"](pages, frames)
+        next_use = next_use_indices(pages)
+        result = feed_in_pieces(resumable_engine("Optimal", frames, next_use=next_use), pages, rng)
+        assert [tuple(fault) for fault in result[3]] == [tuple(fault) for fault in full[3]]
+        assert states(result[0]) == states(full[0])
+        stats = feed_in_pieces(resumable_engine("Optimal", frames, keep_history=False, next_use=next_use), pages, rng)
+        assert stats == stats_of(full)
+
+
+@pytest.mark.parametrize("algorithm", ["LRU", "Optimal"])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_miss_ratio_curve_matches_per_frame_runs(algorithm, seed):
+    pages = random_trace(random.Random(seed))
+    curve = miss_ratio_curve(pages, 20, algorithm)
+    assert curve == [STATS_ENGINES[algorithm](pages, frames)[1] for frames in range(1, 21)]
+
+
+@pytest.mark.parametrize("algorithm", sorted(FAULT_CURVES))
+@pytest.mark.parametrize("seed", SEEDS)
+def test_fault_curve_matches_per_frame_runs(algorithm, seed):
+    pages = random_trace(random.Random(seed))
+    curve = FAULT_CURVES[algorithm](pages, 20)
+    assert list(curve) == [STATS_ENGINES[algorithm](pages, frames)[1] for frames in range(1, 21)]
@@ -0,0 +1,28 @@
+import numpy as np
+
+import shards_mrc
+from shards_mrc import approximate_miss_ratio_curve
+
+
+def test_group_stacks_stay_within_max_pages(monkeypatch):
+    stacks = []
+    init = shards_mrc._SampledLruStack.__init__
+
+    def tracked_init(self):
+        init(self)
+        stacks.append(self)
+
+    monkeypatch.setattr(shards_mrc._SampledLruStack, "__init__", tracked_init)
+    pages = np.random.default_rng(0).zipf(1.2, 300_000) % 50_000
+    approximate_miss_ratio_curve(pages, 64, rate=0.5, max_pages=256)
+    main, groups = stacks[0], stacks[1:]
+    assert len(main.last_use) <= 256
+    assert sum(len(stack.last_use) for stack in groups) == len(main.last_use)
+
+
+def test_unsampled_trace_reports_uninformative_interval():
+    pages = np.random.default_rng(1).integers(0, 51, 5000)
+    estimate = approximate_miss_ratio_curve(pages, 3, rate=0.01)
+    assert estimate["sampled_references"] == 0 and not estimate["bounded"]
+    for lower, upper in zip(estimate["lower"], estimate["upper"]):
+        assert lower == 0 and upper == estimate["references"]
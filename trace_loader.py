@@ -0,0 +1,186 @@
+import mmap
+import os
+import tempfile
+import time
+import numpy as np
+
+# ------------------ Streaming Trace Loader ------------------
+# Page traces are read through a memory map and handed out in fixed-size NumPy
+# chunks, so a multi-GB trace never has to exist as one Python list.
+#   *.i32 / *.i64  raw little-endian binary page numbers
+#   *.bin          raw binary, element type given by `dtype` (default int32)
+#   anything else  whitespace/newline separated text
+
+DEFAULT_CHUNK = 1 << 20  # References per chunk
+BINARY_DTYPES = {".i32": "<i4", ".i64": "<i8", ".bin": "<i4"}
+WHITESPACE = (b" ", b"\n", b"\t", b"\r")
+
+
+def trace_format(path, fmt=None):
+    if fmt:
+        return fmt
+    return "binary" if os.path.splitext(path)[1].lower() in BINARY_DTYPES else "text"
+
+
+def map_trace(path, dtype=None):
+    # Zero-copy view of a binary trace, usable wherever an engine needs a buffer
+    if dtype is None:
+        dtype = BINARY_DTYPES.get(os.path.splitext(path)[1].lower(), "<i4")
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+def _binary_chunks(path, chunk_size, dtype):
+    pages = map_trace(path, dtype)
+    for start in range(0, len(pages), chunk_size):
+        yield pages[start:start + chunk_size]
+
+
+def _text_chunks(path, chunk_size, dtype):
+    # Parsed windows hold a varying number of values; cut them into exact chunks
+    held = np.empty(0, dtype=dtype)
+    for values in _text_windows(path, chunk_size, dtype):
+        held = np.concatenate((held, values)) if len(held) else values
+        while len(held) >= chunk_size:
+            yield held[:chunk_size]
+            held = held[chunk_size:]
+    if len(held):
+        yield held
+
+
+def _text_windows(path, chunk_size, dtype):
+    # Arrays parsed from about chunk_size * 8 bytes each, cut at a separator
+    chunk_bytes = chunk_size * 8  # Rough bytes per reference, including the separator
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start, size = 0, len(mm)
+            while start < size:
+                end = min(start + chunk_bytes, size)
+                if end < size:
+                    # Cut after the last separator so no number is split across chunks
+                    cut = max(mm.rfind(ws, start, end) for ws in WHITESPACE)
+                    if cut < start:
+                        # A single token longer than the chunk: extend to its end
+                        ahead = [pos for pos in (mm.find(ws, end) for ws in WHITESPACE) if pos != -1]
+                        cut = min(ahead) if ahead else size - 1
+                    end = cut + 1
+                tokens = mm[start:end].split()
+                if tokens:
+                    yield np.fromiter(map(int, tokens), dtype=dtype, count=len(tokens))
+                start = end
+
+
+def iter_trace_chunks(path, chunk_size=DEFAULT_CHUNK, fmt=None, dtype=None):
+    # Yields consecutive NumPy arrays of chunk_size page numbers (the last may be shorter)
+    if trace_format(path, fmt) == "binary":
+        return _binary_chunks(path, chunk_size, dtype)
+    return _text_chunks(path, chunk_size, dtype or np.int64)
+
+
+def write_int64_trace(chunks, directory=None):
+    # Spills page chunks (arrays or iterables) to a temporary raw int64 file and
+    # returns its path; the caller removes it
+    fd, path = tempfile.mkstemp(suffix=".i64", dir=directory)
+    with os.fdopen(fd, "wb") as f:
+        for chunk in chunks:
+            if not hasattr(chunk, "__len__"):
+                chunk = np.fromiter(chunk, dtype="<i8")
+            np.asarray(chunk, dtype="<i8").tofile(f)
+    return path
+
+
+def iter_trace_pages(path, chunk_size=DEFAULT_CHUNK, fmt=None, dtype=None):
+    # Flat stream of Python ints for the replacement engines; only one chunk
+    # is ever converted at a time
+    for chunk in iter_trace_chunks(path, chunk_size, fmt, dtype):
+        yield from chunk.tolist()
+
+
+def follow_trace_chunks(path, chunk_size=DEFAULT_CHUNK, fmt=None, dtype=None, poll_interval=0.5, idle_timeout=None):
+    # Like `tail -f`: yields the trace as it is now, then every complete record
+    # appended later. A partial record at the end (half an integer, a number
+    # without its trailing separator) waits for the next poll. Stops after
+    # idle_timeout seconds without growth; never stops when it is None.
+    # When it stops (idle timeout, or KeyboardInterrupt raised while polling or
+    # thrown in with generator.throw) the rest of the file is yielded first,
+    # a final number without a trailing separator included.
+    binary = trace_format(path, fmt) == "binary"
+    if binary:
+        dtype = np.dtype(dtype or BINARY_DTYPES.get(os.path.splitext(path)[1].lower(), "<i4"))
+        read_bytes = chunk_size * dtype.itemsize
+    else:
+        dtype = dtype or np.int64
+        read_bytes = chunk_size * 8  # Rough bytes per reference, as in _text_windows
+
+    def take(final):
+        # Whole records from offset on: about read_bytes of them, more when a
+        # text number runs past that (read on to the next separator, as
+        # _text_windows does). Returns them and whether the file end was reached;
+        # with final, a number without a trailing separator at the end counts.
+        f.seek(offset)
+        data = f.read(read_bytes)
+        at_end = len(data) < read_bytes
+        if binary:
+            return data[:len(data) - len(data) % dtype.itemsize], at_end
+        cut = max(data.rfind(ws) for ws in WHITESPACE)
+        while cut < 0 and not at_end:
+            block = f.read(read_bytes)
+            at_end = len(block) < read_bytes
+            data += block
+            cut = max(data.rfind(ws) for ws in WHITESPACE)
+        return (data if final and at_end else data[:cut + 1]), at_end
+
+    def decode(data):
+        if binary:
+            return np.frombuffer(data, dtype=dtype)
+        tokens = data.split()
+        return np.fromiter(map(int, tokens), dtype=dtype, count=len(tokens)) if tokens else None
+
+    offset, idle_since = 0, time.monotonic()
+    with open(path, "rb") as f:
+        try:
+            while True:
+                data, _ = take(False)
+                if data:
+                    offset += len(data)
+                    idle_since = time.monotonic()
+                    chunk = decode(data)
+                    if chunk is not None:
+                        yield chunk
+                    continue
+                if idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                    break
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            pass  # Stopped by the user; hand over what is left
+
+        while True:
+            data, at_end = take(True)
+            if not data:
+                return  # End of file, or the bytes of a half-written binary record
+            offset += len(data)
+            chunk = decode(data)
+            if chunk is not None:
+                yield chunk
+            if at_end:
+                return
+
+
+def read_tagged_trace(path):
+    # Multi-process text trace, one reference per line: "pid page", or
+    # "timestamp pid page" (stably sorted by timestamp). Returns a list of
+    # (pid, page) tuples in global time order.
+    with open(path, "rb") as f:
+        first = f.readline()
+        columns = len(first.split())
+        f.seek(0)
+        values = np.array(f.read().split(), dtype=np.int64)
+    if columns not in (2, 3) or len(values) % columns:
+        raise ValueError(f"{path}: expected 'pid page' or 'timestamp pid page' on every line")
+    values = values.reshape(-1, columns)
+    if columns == 3:
+        values = values[np.argsort(values[:, 0], kind="stable"), 1:]
+    return list(zip(values[:, 0].tolist(), values[:, 1].tolist()))
@@ -1,71 +1,114 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import heapq
+from collections import OrderedDict
 import time
+from frame_history import FrameHistory
+from page_replacement_engines import clock_page_replacement, lfu_page_replacement
 
 # ------------------ Page Replacement Algorithms ------------------
 
 def fifo_page_replacement(pages, frames):
     frame_list = []
-    history = []
+    history = FrameHistory(frames)
     hits, misses = 0, 0
+    resident = set()
+    oldest = 0  # Slot holding the oldest page
 
-    for page in pages:
-        if page in frame_list:
+    for i, page in enumerate(pages):
+        if page in resident:
             hits += 1
         else:
             misses += 1
             if len(frame_list) < frames:
+                history.record(i, len(frame_list), page)
                 frame_list.append(page)
             else:
-                frame_list.pop(0)
-                frame_list.append(page)
-        history.append(frame_list.copy())
+                resident.discard(frame_list[oldest])
+                frame_list[oldest] = page
+                history.record(i, oldest, page)
+                oldest = (oldest + 1) % frames
+            resident.add(page)
+
+    history.finish(len(pages))
 
     return history, hits, misses
 
 def lru_page_replacement(pages, frames):
     frame_list = []
-    history = []
+    history = FrameHistory(frames)
     hits, misses = 0, 0
-    page_order = []
+    page_order = OrderedDict()  # page -> slot, least recently used first
 
-    for page in pages:
-        if page in frame_list:
+    for i, page in enumerate(pages):
+        if page in page_order:
             hits += 1
-            page_order.remove(page)
+            page_order.move_to_end(page)
         else:
             misses += 1
             if len(frame_list) < frames:
+                page_order[page] = len(frame_list)
+                history.record(i, len(frame_list), page)
                 frame_list.append(page)
             else:
-                lru_page = page_order.pop(0)
-                frame_list[frame_list.index(lru_page)] = page
+                lru_page, slot = page_order.popitem(last=False)
+                frame_list[slot] = page
+                history.record(i, slot, page)
+                page_order[page] = slot
 
-        page_order.append(page)
-        history.append(frame_list.copy())
+    history.finish(len(pages))
 
     return history, hits, misses
 
+def next_use_indices(pages):
+    # Index of the next reference to pages[i], or len(pages) if there is none
+    n = len(pages)
+    next_use = [n] * n
+    last_seen = {}
+    for i in range(n - 1, -1, -1):
+        next_use[i] = last_seen.get(pages[i], n)
+        last_seen[pages[i]] = i
+    return next_use
+
 def optimal_page_replacement(pages, frames):
     frame_list = []
-    history = []
+    history = FrameHistory(frames)
     hits, misses = 0, 0
+    slot_of = {}
+    slot_next = []
+    heap = []
+
+    next_use = next_use_indices(pages)
 
     for i in range(len(pages)):
         page = pages[i]
+        slot = slot_of.get(page)
 
-        if page in frame_list:
+        if slot is not None:
             hits += 1
         else:
             misses += 1
             if len(frame_list) < frames:
+                slot = len(frame_list)
                 frame_list.append(page)
+                slot_next.append(0)
             else:
-                future_use = {frame: pages[i+1:].index(frame) if frame in pages[i+1:] else float('inf') for frame in frame_list}
-                page_to_replace = max(future_use, key=future_use.get)
-                frame_list[frame_list.index(page_to_replace)] = page
-
-        history.append(frame_list.copy())
+                while True:
+                    neg_next, slot = heapq.heappop(heap)
+                    if slot_next[slot] == -neg_next:
+                        break
+                del slot_of[frame_list[slot]]
+                frame_list[slot] = page
+            slot_of[page] = slot
+            history.record(i, slot, page)
+
+        slot_next[slot] = next_use[i]
+        heapq.heappush(heap, (-next_use[i], slot))
+        if len(heap) > 2 * frames + 16:
+            heap = [(-slot_next[s], s) for s in range(len(frame_list))]
+            heapq.heapify(heap)
+
+    history.finish(len(pages))
 
     return history, hits, misses
 
@@ -79,14 +122,16 @@ def display_table(history, pages, frames):
     table_output += "Pages:  " + "  ".join(f"{page:>{column_width}}" for page in pages) + "\n"
     table_output += "+" + ("-" * (column_width + 1)) * len(pages) + "+\n"
 
-    # Frame Rows
-    for i in range(frames):
-        row = [f"Frame {i+1} |"]
-        for step in history:
+    # Frame Rows, filled in a single replay of the history
+    rows = [[f"Frame {i+1} |"] for i in range(frames)]
+    for step in history:
+        for i in range(frames):
             if i < len(step):
-                row.append(f"{step[i]:>{column_width}}")
+                rows[i].append(f"{step[i]:>{column_width}}")
             else:
-                row.append(" " * column_width)
+                rows[i].append(" " * column_width)
+
+    for row in rows:
         table_output += " | ".join(row) + " |\n"
         table_output += "+" + ("-" * (column_width + 1)) * len(pages) + "+\n"
 
@@ -114,6 +159,10 @@ def run_simulation():
             history, hits, misses = lru_page_replacement(page_refs, num_frames)
         elif selected_algo == "Optimal":
             history, hits, misses = optimal_page_replacement(page_refs, num_frames)
+        elif selected_algo == "LFU":
+            history, hits, misses, _ = lfu_page_replacement(page_refs, num_frames)
+        elif selected_algo == "Clock":
+            history, hits, misses, _ = clock_page_replacement(page_refs, num_frames)
         else:
             messagebox.showerror("Error", "Invalid algorithm selected!")
             return
@@ -151,7 +200,7 @@ tk.Label(root, text="Page Replacement Algorithm Simulator", font=("Arial", 14, "
 # Algorithm Selection
 tk.Label(root, text="Select Algorithm:", bg="lightgray").pack()
 algo_var = tk.StringVar(value="FIFO")
-algo_menu = ttk.Combobox(root, textvariable=algo_var, values=["FIFO", "LRU", "Optimal"], state="readonly")
+algo_menu = ttk.Combobox(root, textvariable=algo_var, values=["FIFO", "LRU", "Optimal", "LFU", "Clock"], state="readonly")
 algo_menu.pack(pady=5)
 
 # Number of Frames